@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 load_dotenv()
 # Importing environment variables
 SECRET_KEY = os.getenv('DJANGO_SECRET_KEY')
@@ -22,6 +23,11 @@ DB_PASSWORD = os.getenv('DB_PASSWORD')
 DB_HOST = os.getenv('DB_HOST')
 DB_PORT = os.getenv('DB_PORT')
 
+KAFKA_BOOTSTRAP_SERVERS = os.getenv('KAFKA_BOOTSTRAP_SERVERS', 'kafka:9092')
+USER_EVENTS_TOPIC = os.getenv('USER_EVENTS_TOPIC', 'user-events')
+# Each service needs its own consumer group so every replica sees every event.
+USER_REPLICA_CONSUMER_GROUP = os.getenv('USER_REPLICA_CONSUMER_GROUP', 'goal-service-user-replica')
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -40,6 +46,11 @@ ALLOWED_HOSTS = []
 
 # Application definition
 
+# SERVICE_PROFILE: 'api' or 'full' (see docker-compose.yml)
+SERVICE_PROFILE = os.getenv('SERVICE_PROFILE', 'full')
+if SERVICE_PROFILE not in ('api', 'full'):
+    raise ImproperlyConfigured(f"SERVICE_PROFILE must be 'api' or 'full', not {SERVICE_PROFILE!r}")
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -49,6 +60,8 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'goals', 
+    # Local copy of user profiles, fed by user-service events (shared/user_replica).
+    'user_replica',
 ]
 
 MIDDLEWARE = [
@@ -61,6 +74,18 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if SERVICE_PROFILE == 'api':
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS
+        if app not in ('django.contrib.admin', 'django.contrib.sessions',
+                       'django.contrib.messages', 'django.contrib.staticfiles')
+    ]
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.common.CommonMiddleware',
+    ]
+    REST_FRAMEWORK = {'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer']}
+
 ROOT_URLCONF = 'goal_service.urls'
 
 TEMPLATES = [
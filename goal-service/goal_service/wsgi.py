@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'goal_service.settings')
 
 application = get_wsgi_application()
+
+# Fetch the token signing keys now, so no request waits on user-service.
+from jwt_auth.authentication import warm_keys  # noqa: E402
+warm_keys()
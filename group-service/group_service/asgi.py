@@ -16,3 +16,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'group_service.settings')
 
 application = get_asgi_application()
 
+# Fetch the token signing keys now, so no request waits on user-service.
+from jwt_auth.authentication import warm_keys  # noqa: E402
+warm_keys()
+
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 load_dotenv()
 import os
 
@@ -23,6 +24,25 @@ DB_PASSWORD = os.getenv('DB_PASSWORD')
 DB_HOST = os.getenv('DB_HOST')
 DB_PORT = os.getenv('DB_PORT')
 
+KAFKA_BOOTSTRAP_SERVERS = os.getenv('KAFKA_BOOTSTRAP_SERVERS', 'kafka:9092')
+# Producer tuning: wait up to linger_ms to fill a batch of batch_size bytes.
+# Only relay_outbox talks to Kafka (requests just write outbox rows); max_block_ms
+# bounds how long its send() waits on an unreachable broker before the batch is
+# counted as failed and the relay backs off.
+KAFKA_PRODUCER_LINGER_MS = int(os.getenv('KAFKA_PRODUCER_LINGER_MS', 5))
+KAFKA_PRODUCER_BATCH_SIZE = int(os.getenv('KAFKA_PRODUCER_BATCH_SIZE', 16384))
+KAFKA_PRODUCER_COMPRESSION = os.getenv('KAFKA_PRODUCER_COMPRESSION') or None
+KAFKA_PRODUCER_MAX_BLOCK_MS = int(os.getenv('KAFKA_PRODUCER_MAX_BLOCK_MS', 1000))
+
+# Number of most recent events embedded in group list/detail responses.
+GROUP_RECENT_EVENTS_LIMIT = int(os.getenv('GROUP_RECENT_EVENTS_LIMIT', 20))
+# Only events this recent are embedded, which keeps those reads on the newest partitions.
+GROUP_RECENT_EVENTS_DAYS = int(os.getenv('GROUP_RECENT_EVENTS_DAYS', 90))
+
+USER_EVENTS_TOPIC = os.getenv('USER_EVENTS_TOPIC', 'user-events')
+# Each service needs its own consumer group so every replica sees every event.
+USER_REPLICA_CONSUMER_GROUP = os.getenv('USER_REPLICA_CONSUMER_GROUP', 'group-service-user-replica')
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,6 +61,11 @@ ALLOWED_HOSTS = []
 
 # Application definition
 
+# SERVICE_PROFILE: 'api' or 'full' (see docker-compose.yml)
+SERVICE_PROFILE = os.getenv('SERVICE_PROFILE', 'full')
+if SERVICE_PROFILE not in ('api', 'full'):
+    raise ImproperlyConfigured(f"SERVICE_PROFILE must be 'api' or 'full', not {SERVICE_PROFILE!r}")
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -50,6 +75,8 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'groups',
+    # Local copy of user profiles, fed by user-service events (shared/user_replica).
+    'user_replica',
 
 ]
 
@@ -63,6 +90,18 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if SERVICE_PROFILE == 'api':
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS
+        if app not in ('django.contrib.admin', 'django.contrib.sessions',
+                       'django.contrib.messages', 'django.contrib.staticfiles')
+    ]
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.common.CommonMiddleware',
+    ]
+    REST_FRAMEWORK = {'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer']}
+
 ROOT_URLCONF = 'group_service.urls'
 
 TEMPLATES = [
@@ -139,3 +178,22 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Cache for group detail payloads. Local memory by default; point
+# CACHE_BACKEND/CACHE_LOCATION at a shared backend to share it across workers.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'group-service'),
+    }
+}
+GROUP_DETAIL_CACHE_TIMEOUT = int(os.getenv('GROUP_DETAIL_CACHE_TIMEOUT', 300))
+GROUP_DETAIL_CACHE_LOCK_TIMEOUT = int(os.getenv('GROUP_DETAIL_CACHE_LOCK_TIMEOUT', 5))
+# Per-group version counters outlive many payloads so most rebuilds go through
+# the stampede lock, but still expire for groups nobody reads any more.
+GROUP_CACHE_VERSION_TIMEOUT = int(os.getenv('GROUP_CACHE_VERSION_TIMEOUT', 24 * 3600))
+
+# Group event partitions older than this many months are archived and dropped
+# by `manage.py partition_group_events`.
+GROUP_EVENT_RETAIN_MONTHS = int(os.getenv('GROUP_EVENT_RETAIN_MONTHS', 12))
+GROUP_EVENT_ARCHIVE_DIR = os.getenv('GROUP_EVENT_ARCHIVE_DIR', str(BASE_DIR / 'event_archive'))
@@ -14,10 +14,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/', include('groups.urls')),
+    # Async handlers; serve under ASGI (e.g. uvicorn group_service.asgi:application).
+    path('api/async/', include('groups.async_urls')),
 ]
+
+# Admin only exists in the full profile; API processes run SERVICE_PROFILE=api.
+if settings.SERVICE_PROFILE == 'full':
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
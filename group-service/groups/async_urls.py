@@ -0,0 +1,16 @@
+from django.urls import path
+from .async_views import (
+    AsyncGroupCreationView,
+    AsyncGroupJoinView,
+    AsyncGroupLeaveView,
+    AsyncGroupListView,
+    AsyncGroupDetailView,
+)
+
+urlpatterns = [
+    path('groups/create/', AsyncGroupCreationView.as_view(), name='async-group-create'),
+    path('groups/join/', AsyncGroupJoinView.as_view(), name='async-group-join'),
+    path('groups/leave/', AsyncGroupLeaveView.as_view(), name='async-group-leave'),
+    path('groups/', AsyncGroupListView.as_view(), name='async-group-list'),
+    path('groups/<int:group_id>/', AsyncGroupDetailView.as_view(), name='async-group-detail'),
+]
@@ -0,0 +1,124 @@
+"""
+Async counterparts of the group views, for serving under ASGI.
+
+Reads go through Django's async ORM. Writes are transactional, which the
+async ORM does not support, so they run the same sync code as the WSGI
+views via sync_to_async. Under ASGI each request gets its own sync thread,
+so concurrent requests do not queue behind one another.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import JWTAuthentication
+from .cache import get_group_detail
+from .membership import GroupNotFound, MembershipError, create_group, join_group, leave_group
+from .models import Group
+from .serializers import GroupSerializer, GroupMemberSerializer, GroupListSerializer
+from .views import group_queryset
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncAPIView(View):
+    """
+    Minimal async stand-in for APIView: bearer token auth and JSON bodies.
+    """
+    authentication = JWTAuthentication()
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            # Token verification is sync code; keep it off the event loop.
+            result = await sync_to_async(self.authentication.authenticate)(request)
+        except AuthenticationFailed as e:
+            return JsonResponse({'detail': str(e.detail)}, status=401)
+        if result is None:
+            return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+        request.user = result[0]
+        return await super().dispatch(request, *args, **kwargs)
+
+    def json_body(self, request):
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+
+class AsyncGroupCreationView(AsyncAPIView):
+
+    async def post(self, request):
+        serializer = GroupSerializer(data=self.json_body(request))
+        # Validation checks name uniqueness against the database.
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=400)
+
+        group = await sync_to_async(create_group)(request.user.id, **serializer.validated_data)
+        return JsonResponse(GroupSerializer(group).data, status=201)
+
+
+class AsyncGroupJoinView(AsyncAPIView):
+
+    async def post(self, request):
+        group_id = (self.json_body(request) or {}).get('group_id')
+
+        if not group_id:
+            return JsonResponse({'error': 'group_id is required'}, status=400)
+
+        try:
+            join = await sync_to_async(join_group)(group_id, request.user.id)
+        except GroupNotFound as e:
+            return JsonResponse({'error': e.message}, status=404)
+        except MembershipError as e:
+            return JsonResponse({'error': e.message}, status=400)
+
+        return JsonResponse(GroupMemberSerializer(join).data, status=201)
+
+
+class AsyncGroupLeaveView(AsyncAPIView):
+
+    async def post(self, request):
+        group_id = (self.json_body(request) or {}).get('group_id')
+
+        if not group_id:
+            return JsonResponse({'error': 'group_id is required'}, status=400)
+
+        try:
+            await sync_to_async(leave_group)(group_id, request.user.id)
+        except GroupNotFound as e:
+            return JsonResponse({'error': e.message}, status=404)
+        except MembershipError as e:
+            return JsonResponse({'error': e.message}, status=400)
+
+        return JsonResponse({'message': 'Successfully left group'}, status=200)
+
+
+class AsyncGroupListView(AsyncAPIView):
+
+    async def get(self, request):
+        groups = [
+            group async for group in group_queryset().filter(
+                memberships__user_id=request.user.id,
+                memberships__left_at__isnull=True
+            ).order_by('id')
+        ]
+        return JsonResponse(GroupListSerializer(groups, many=True).data, safe=False)
+
+
+class AsyncGroupDetailView(AsyncAPIView):
+
+    async def get(self, request, group_id):
+        def build():
+            return GroupListSerializer(group_queryset().get(id=group_id)).data
+
+        try:
+            payload = await sync_to_async(get_group_detail)(group_id, build)
+        except Group.DoesNotExist:
+            return JsonResponse({'error': 'Group not found'}, status=404)
+
+        return JsonResponse(payload)
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# Process-local counters, read by GroupCacheStatsView.
+_stats = {'hits': 0, 'misses': 0, 'rebuilds': 0, 'waits': 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+    stats['pid'] = os.getpid()
+    return stats
+
+
+def _version_key(group_id):
+    return f"group:{group_id}:version"
+
+
+def _detail_key(group_id, version):
+    return f"group:{group_id}:detail:v{version}"
+
+
+def _new_version():
+    # Seeded from the clock rather than 1, so an expired or evicted counter can
+    # never line up with a stale payload written under an earlier version.
+    return time.time_ns() // 1000
+
+
+def _seed_version(group_id, version):
+    """
+    Stores version unless the group already has one; returns the stored one.
+    Versions expire (GROUP_CACHE_VERSION_TIMEOUT), so groups that are no
+    longer read do not keep keys forever; a reseeded version is always newer.
+    """
+    key = _version_key(group_id)
+    cache.add(key, version, timeout=settings.GROUP_CACHE_VERSION_TIMEOUT)
+    return cache.get(key)
+
+
+def bump_version(group_id):
+    try:
+        cache.incr(_version_key(group_id))
+    except ValueError:
+        # Counter has expired; a fresh clock-seeded one is already newer.
+        _seed_version(group_id, _new_version())
+
+
+def invalidate_group(group_id):
+    """
+    Retires the cached detail payload for the group once the current
+    transaction commits, so no reader can re-cache pre-commit data under
+    the new version.
+    """
+    transaction.on_commit(lambda: bump_version(group_id))
+
+
+def get_group_detail(group_id, build):
+    """
+    Returns the cached detail payload for the group, calling build() on a miss.
+
+    Only one caller rebuilds a given version: it takes a short-lived lock via
+    cache.add(), and other callers poll for the result instead of stampeding
+    the database. If the rebuild fails or takes too long they fall back to
+    building their own copy.
+
+    A group without a version yet gets one only after build() succeeds, so
+    lookups of missing groups write nothing.
+    """
+    version = cache.get(_version_key(group_id))
+    if version is None:
+        _count('misses')
+        candidate = _new_version()
+        payload = build()
+        # An invalidation that ran during build() seeded its own version;
+        # the payload may predate it, so only cache it under our own.
+        if _seed_version(group_id, candidate) == candidate:
+            cache.set(_detail_key(group_id, candidate), payload, timeout=settings.GROUP_DETAIL_CACHE_TIMEOUT)
+            _count('rebuilds')
+        return payload
+
+    key = _detail_key(group_id, version)
+    payload = cache.get(key)
+    if payload is not None:
+        _count('hits')
+        return payload
+
+    _count('misses')
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=settings.GROUP_DETAIL_CACHE_LOCK_TIMEOUT):
+        try:
+            payload = build()
+            cache.set(key, payload, timeout=settings.GROUP_DETAIL_CACHE_TIMEOUT)
+            _count('rebuilds')
+        finally:
+            cache.delete(lock_key)
+        return payload
+
+    _count('waits')
+    deadline = time.monotonic() + settings.GROUP_DETAIL_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        payload = cache.get(key)
+        if payload is not None:
+            return payload
+        if cache.get(lock_key) is None:
+            break
+    return build()
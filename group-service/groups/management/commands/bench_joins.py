@@ -0,0 +1,61 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from groups.membership import MembershipError, join_group
+from groups.models import Group, GroupMember, OutboxMessage
+
+
+class Command(BaseCommand):
+    help = (
+        "Fires many concurrent joins at one group and checks that it is never "
+        "over-admitted and that member_count matches the active memberships."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--joins', type=int, default=300,
+                            help="Number of distinct users trying to join.")
+        parser.add_argument('--workers', type=int, default=64,
+                            help="Concurrent threads, each with its own DB connection.")
+        parser.add_argument('--keep', action='store_true',
+                            help="Keep the benchmark group instead of deleting it.")
+
+    def _join(self, group_id, user_id):
+        # One connection per attempt, like a request with CONN_MAX_AGE=0.
+        try:
+            join_group(group_id, user_id)
+            return 'joined'
+        except MembershipError as e:
+            return e.message
+        finally:
+            connection.close()
+
+    def handle(self, *args, **options):
+        group = Group.objects.create(name=f"bench-{uuid.uuid4().hex[:12]}", creator_id=0)
+        user_ids = range(1, options['joins'] + 1)
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            outcomes = list(pool.map(lambda user_id: self._join(group.id, user_id), user_ids))
+        elapsed = time.monotonic() - started
+
+        group.refresh_from_db()
+        active = GroupMember.objects.filter(group=group, left_at__isnull=True).count()
+        joined = outcomes.count('joined')
+
+        self.stdout.write(f"{options['joins']} joins, {options['workers']} workers: {elapsed:.2f}s "
+                          f"({options['joins'] / elapsed:.0f} joins/s)")
+        self.stdout.write(f"admitted={joined} rejected={len(outcomes) - joined} "
+                          f"member_count={group.member_count} active_memberships={active}")
+
+        if not options['keep']:
+            OutboxMessage.objects.filter(payload__group_id=group.id).delete()
+            group.delete()
+
+        expected = min(options['joins'], Group.MAX_MEMBERS)
+        if not (joined == active == group.member_count == expected):
+            raise CommandError("Membership counters diverged under concurrent joins")
+        self.stdout.write(self.style.SUCCESS("No over-admission and no lost counter updates"))
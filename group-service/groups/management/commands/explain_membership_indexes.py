@@ -0,0 +1,108 @@
+import json
+import random
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from groups.models import Group, GroupMember
+
+MEMBER_TABLE = GroupMember._meta.db_table
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a large membership dataset inside a rolled-back transaction and "
+        "checks with EXPLAIN that the membership access paths use their indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--groups', type=int, default=20000)
+        parser.add_argument('--members-per-group', type=int, default=25)
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Index checks require PostgreSQL.")
+
+        with transaction.atomic():
+            group_ids = self.seed(options)
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Group._meta.db_table}")
+                cursor.execute(f"ANALYZE {MEMBER_TABLE}")
+
+            failures = []
+            for label, queryset, expected in self.checks(group_ids):
+                used = self.indexes_used(queryset)
+                ok = expected in used if expected else (used and MEMBER_TABLE not in used.get('Seq Scan', ()))
+                self.stdout.write(f"{'ok  ' if ok else 'FAIL'} {label}: {sorted(k for k in used if k != 'Seq Scan')}")
+                if not ok:
+                    failures.append(label)
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"Index not used for: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All membership queries use their indexes"))
+
+    def seed(self, options):
+        rng = random.Random(options['seed'])
+        prefix = uuid.uuid4().hex[:8]
+        groups = Group.objects.bulk_create(
+            (Group(name=f"explain-{prefix}-{i}", creator_id=1) for i in range(options['groups'])),
+            batch_size=5000
+        )
+
+        now = timezone.now()
+        members = []
+        for group in groups:
+            for user_id in rng.sample(range(1, options['users'] + 1), options['members_per_group']):
+                # Roughly one membership in five has ended.
+                left_at = now - timedelta(days=rng.randint(1, 300)) if rng.random() < 0.2 else None
+                members.append(GroupMember(group=group, user_id=user_id, left_at=left_at))
+        GroupMember.objects.bulk_create(members, batch_size=5000)
+        return [group.id for group in groups]
+
+    def checks(self, group_ids):
+        member = GroupMember.objects.filter(group_id=group_ids[0]).first()
+        return [
+            (
+                "my groups (GroupListView)",
+                Group.objects.filter(memberships__user_id=member.user_id, memberships__left_at__isnull=True),
+                'groupmember_active_user_idx',
+            ),
+            (
+                "group roster (members prefetch)",
+                GroupMember.objects.filter(group_id__in=group_ids[:20], left_at__isnull=True)
+                .only('id', 'group_id', 'user_id', 'role', 'joined_at').order_by('joined_at', 'id'),
+                'groupmember_roster_idx',
+            ),
+            (
+                "membership check (join/leave)",
+                GroupMember.objects.filter(group_id=member.group_id, user_id=member.user_id, left_at__isnull=True),
+                None,
+            ),
+        ]
+
+    def indexes_used(self, queryset):
+        """
+        Maps each index name in the plan to the tables it scans. Sequential
+        scans are collected under the 'Seq Scan' key.
+        """
+        plan = json.loads(queryset.explain(format='json'))[0]['Plan']
+        used = {}
+        for node in plan_nodes(plan):
+            if 'Index Name' in node:
+                used.setdefault(node['Index Name'], set()).add(node.get('Relation Name'))
+            elif node['Node Type'] == 'Seq Scan':
+                used.setdefault('Seq Scan', set()).add(node['Relation Name'])
+        return used
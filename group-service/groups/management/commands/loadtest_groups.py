@@ -0,0 +1,63 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests a group endpoint on one or more running servers, e.g. the "
+        "WSGI views against the ASGI ones:\n"
+        "  loadtest_groups --token $TOKEN --path groups/ "
+        "--target wsgi=http://localhost:8002/api/ --target asgi=http://localhost:8012/api/async/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', action='append', required=True,
+                            help="name=base_url, repeatable.")
+        parser.add_argument('--path', default='groups/',
+                            help="Endpoint path appended to each base URL.")
+        parser.add_argument('--token', required=True,
+                            help="Bearer access token sent with every request.")
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=100)
+
+    def handle(self, *args, **options):
+        for target in options['target']:
+            name, sep, base_url = target.partition('=')
+            if not sep:
+                raise CommandError(f"Expected name=base_url, got {target!r}")
+            self.run(name, base_url.rstrip('/') + '/' + options['path'].lstrip('/'), options)
+
+    def fetch(self, url, token):
+        request = urllib.request.Request(url, headers={'Authorization': f'Bearer {token}'})
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                ok = response.status < 400
+        except (urllib.error.URLError, OSError):
+            ok = False
+        return ok, time.perf_counter() - started
+
+    def run(self, name, url, options):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(lambda _: self.fetch(url, options['token']), range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for ok, latency in results if ok)
+        errors = len(results) - len(latencies)
+        if not latencies:
+            self.stdout.write(self.style.ERROR(f"{name}: all {errors} requests failed ({url})"))
+            return
+
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{name}: {len(results) / elapsed:.0f} req/s, "
+            f"p50 {statistics.median(latencies) * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms, "
+            f"{errors} errors ({options['concurrency']} concurrent, {url})"
+        )
@@ -0,0 +1,234 @@
+import gzip
+import os
+import re
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from groups.models import GroupEvent
+
+TABLE = GroupEvent._meta.db_table
+GROUP_TABLE = GroupEvent._meta.get_field('group').related_model._meta.db_table
+PARTITION_RE = re.compile(rf'^{TABLE}_p(\d{{4}})(\d{{2}})$')
+# Catches rows outside every monthly partition, so a lapsed schedule does not
+# make GroupEvent inserts (and the membership writes around them) fail.
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def month_start(value):
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(start):
+    return f"{TABLE}_p{start:%Y%m}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Maintains monthly range partitions of the group event table: creates "
+        "upcoming partitions and archives expired ones to gzipped CSV before "
+        "dropping them. Run --convert once to partition an existing table, then "
+        "schedule this command at least monthly. Events that arrive before their "
+        "month's partition exists go to a DEFAULT partition; the next run moves "
+        "them into place and exits with an error so the lapse gets noticed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true',
+                            help="Convert the existing table into a partitioned one (takes an exclusive lock).")
+        parser.add_argument('--months-ahead', type=int, default=3,
+                            help="Future months to keep partitions ready for.")
+        parser.add_argument('--retain-months', type=int, default=settings.GROUP_EVENT_RETAIN_MONTHS,
+                            help="Whole months of events to keep online; 0 keeps everything.")
+        parser.add_argument('--archive-dir', default=settings.GROUP_EVENT_ARCHIVE_DIR,
+                            help="Directory for archived partitions.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Partitioning requires PostgreSQL.")
+
+        if options['convert']:
+            self.convert(options['months_ahead'])
+        elif not self.is_partitioned():
+            raise CommandError(f"{TABLE} is not partitioned yet; run with --convert first.")
+
+        moved, remaining = self.create_upcoming(options['months_ahead'])
+        if options['retain_months'] > 0:
+            self.archive_expired(options['retain_months'], Path(options['archive_dir']))
+
+        if moved or remaining:
+            raise CommandError(
+                f"{moved + remaining} events had landed in {DEFAULT_PARTITION} because their month's "
+                f"partition did not exist; {moved} were moved into place and {remaining} are still there. "
+                f"Run this command at least monthly."
+            )
+
+    def is_partitioned(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+                [TABLE]
+            )
+            return cursor.fetchone() is not None
+
+    def partitions(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = %s",
+                [TABLE]
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        found = {}
+        for name in names:
+            match = PARTITION_RE.match(name)
+            if match:
+                found[name] = datetime(int(match[1]), int(match[2]), 1, tzinfo=dt_timezone.utc)
+        return dict(sorted(found.items(), key=lambda item: item[1]))
+
+    def create_partition(self, cursor, start):
+        """
+        Creates the partition for start's month and returns the number of rows
+        moved into it from the DEFAULT partition.
+        """
+        name = partition_name(start)
+        end = add_months(start, 1)
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+        if cursor.fetchone()[0]:
+            return 0
+
+        stray = 0
+        if self.has_default(cursor):
+            cursor.execute(f"SELECT COUNT(*) FROM {DEFAULT_PARTITION} WHERE occurred_at >= %s AND occurred_at < %s",
+                           [start, end])
+            stray = cursor.fetchone()[0]
+
+        if not stray:
+            cursor.execute(f"CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)", [start, end])
+            return 0
+
+        # A new range may not overlap rows already in DEFAULT: detach it, create
+        # the partition, move the month's rows across and attach DEFAULT again.
+        cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+        cursor.execute(f"CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)", [start, end])
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE occurred_at >= %s AND occurred_at < %s RETURNING *) "
+            f"INSERT INTO {TABLE} (id, group_id, user_id, event_type, occurred_at) "
+            f"SELECT id, group_id, user_id, event_type, occurred_at FROM moved",
+            [start, end]
+        )
+        cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+        return stray
+
+    def has_default(self, cursor):
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [DEFAULT_PARTITION])
+        return cursor.fetchone()[0]
+
+    def create_upcoming(self, months_ahead):
+        current = month_start(timezone.now())
+        with transaction.atomic(), connection.cursor() as cursor:
+            if not self.has_default(cursor):
+                cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+
+            moved = 0
+            cursor.execute(f"SELECT MIN(occurred_at) FROM {DEFAULT_PARTITION}")
+            oldest = cursor.fetchone()[0]
+            # Months missed while the schedule lapsed come first, then the ones ahead.
+            start = min(month_start(oldest), current) if oldest else current
+            while start <= add_months(current, months_ahead):
+                moved += self.create_partition(cursor, start)
+                start = add_months(start, 1)
+
+            cursor.execute(f"SELECT COUNT(*) FROM {DEFAULT_PARTITION}")
+            remaining = cursor.fetchone()[0]
+
+        self.stdout.write(f"Partitions ready through {add_months(current, months_ahead + 1):%Y-%m}")
+        return moved, remaining
+
+    def convert(self, months_ahead):
+        if self.is_partitioned():
+            self.stdout.write(f"{TABLE} is already partitioned")
+            return
+
+        legacy = f"{TABLE}_legacy"
+        sequence = f"{TABLE}_part_id_seq"
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+            cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {legacy}")
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0), MIN(occurred_at) FROM {legacy}")
+            max_id, oldest = cursor.fetchone()
+
+            # The primary key of a partitioned table must include the partition key.
+            cursor.execute(f"CREATE SEQUENCE {sequence}")
+            cursor.execute("SELECT setval(%s, %s, false)", [sequence, max_id + 1])
+            cursor.execute(f"""
+                CREATE TABLE {TABLE} (
+                    id bigint NOT NULL DEFAULT nextval('{sequence}'),
+                    group_id bigint NOT NULL,
+                    user_id integer NULL CHECK (user_id >= 0),
+                    event_type varchar(20) NOT NULL,
+                    occurred_at timestamp with time zone NOT NULL,
+                    PRIMARY KEY (id, occurred_at)
+                ) PARTITION BY RANGE (occurred_at)
+            """)
+            cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id")
+
+            start = month_start(oldest or timezone.now())
+            last = add_months(month_start(timezone.now()), months_ahead)
+            while start <= last:
+                self.create_partition(cursor, start)
+                start = add_months(start, 1)
+            cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+
+            cursor.execute(
+                f"INSERT INTO {TABLE} (id, group_id, user_id, event_type, occurred_at) "
+                f"SELECT id, group_id, user_id, event_type, occurred_at FROM {legacy}"
+            )
+            copied = cursor.rowcount
+            cursor.execute(f"DROP TABLE {legacy}")
+
+            # Recreated on the parent so they cascade to every partition.
+            cursor.execute(
+                f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_group_id_fk_{GROUP_TABLE}_id "
+                f"FOREIGN KEY (group_id) REFERENCES {GROUP_TABLE} (id) DEFERRABLE INITIALLY DEFERRED"
+            )
+            for index in GroupEvent._meta.indexes:
+                columns = ', '.join(GroupEvent._meta.get_field(field).column for field in index.fields)
+                cursor.execute(f"CREATE INDEX {index.name} ON {TABLE} ({columns})")
+
+        self.stdout.write(self.style.SUCCESS(f"Converted {TABLE} to monthly partitions ({copied} rows copied)"))
+
+    def archive_expired(self, retain_months, archive_dir):
+        cutoff = add_months(month_start(timezone.now()), -retain_months)
+        expired = [(name, start) for name, start in self.partitions().items() if add_months(start, 1) <= cutoff]
+        if not expired:
+            return
+
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        for name, start in expired:
+            path = archive_dir / f"{name}.csv.gz"
+            partial = path.with_name(path.name + '.partial')
+
+            # Old months no longer receive writes, so the copy is complete
+            # before the partition is detached and dropped.
+            with gzip.open(partial, 'wb') as fh, connection.cursor() as cursor:
+                cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)", fh)
+            os.replace(partial, path)
+
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+                cursor.execute(f"DROP TABLE {name}")
+
+            self.stdout.write(f"Archived {name} ({start:%Y-%m}) to {path}")
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+from kafka.errors import KafkaError
+
+from groups.outbox import relay_batch
+
+
+class Command(BaseCommand):
+    help = "Publishes pending outbox messages to Kafka in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help="Messages claimed and published per transaction.")
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help="Seconds to sleep when the outbox is drained.")
+        parser.add_argument('--report-interval', type=float, default=10.0,
+                            help="Seconds between throughput reports.")
+        parser.add_argument('--max-backoff', type=float, default=30.0,
+                            help="Longest pause between attempts while Kafka is unreachable.")
+        parser.add_argument('--once', action='store_true',
+                            help="Drain the outbox once and exit.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = 0
+        window_count = 0
+        backoff = 0.0
+        started = window_started = time.monotonic()
+
+        try:
+            while True:
+                try:
+                    relayed = relay_batch(batch_size)
+                except KafkaError as e:
+                    # The batch stays pending with its attempts counted; keep
+                    # retrying rather than exiting and letting the outbox grow.
+                    backoff = min(options['max_backoff'], max(options['poll_interval'], backoff * 2))
+                    self.stderr.write(f"⚠️ Kafka error: {e}; retrying in {backoff:.0f}s")
+                    time.sleep(backoff)
+                    continue
+                backoff = 0.0
+                total += relayed
+                window_count += relayed
+
+                now = time.monotonic()
+                if now - window_started >= options['report_interval']:
+                    rate = window_count / (now - window_started)
+                    self.stdout.write(f"Relayed {window_count} messages ({rate:.1f} msg/s), {total} total")
+                    window_count = 0
+                    window_started = now
+
+                if relayed < batch_size:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(f"Relayed {total} messages in {elapsed:.1f}s ({rate:.1f} msg/s)"))
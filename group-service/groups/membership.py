@@ -0,0 +1,197 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Group, GroupMember
+from .outbox import record_event, record_events
+
+
+class MembershipError(Exception):
+    """
+    Base class for join/leave failures. Carries the API error message.
+    """
+    default_message = 'Membership change failed'
+
+    def __init__(self, message=None):
+        self.message = message or self.default_message
+        super().__init__(self.message)
+
+
+class GroupNotFound(MembershipError):
+    default_message = 'Group not found'
+
+
+class GroupFull(MembershipError):
+    default_message = 'Group is full'
+
+
+class AlreadyMember(MembershipError):
+    default_message = 'User already a member'
+
+
+class NotMember(MembershipError):
+    default_message = 'User is not a member of this group'
+
+
+def create_group(creator_id, **fields):
+    """
+    Creates a group with its creator as the first (admin) member.
+    """
+    with transaction.atomic():
+        group = Group.objects.create(creator_id=creator_id, member_count=1, **fields)
+        GroupMember.objects.create(group=group, user_id=creator_id, role='admin')
+
+        message = {
+            'group_id': group.id,
+            'name': group.name,
+            'creator_id': group.creator_id,
+            'created_at': group.created_at.isoformat(),
+        }
+        record_event(group.id, creator_id, 'created', 'group_created', message)
+
+    return group
+
+
+def join_group(group_id, user_id, role='member'):
+    """
+    Adds user_id to the group and returns the new GroupMember.
+
+    A seat is claimed with a single conditional UPDATE
+    (member_count = member_count + 1 WHERE member_count < MAX_MEMBERS), so
+    concurrent joins serialize on the group row and can never over-admit.
+    A duplicate join trips the (group, user_id) unique constraint and rolls
+    the seat back with the rest of the transaction.
+    """
+    group_id = int(group_id)
+    with transaction.atomic():
+        admitted = (
+            Group.objects
+            .filter(id=group_id, member_count__lt=Group.MAX_MEMBERS)
+            .update(member_count=F('member_count') + 1)
+        )
+        if not admitted:
+            # Only the failure path pays for working out why.
+            if not Group.objects.filter(id=group_id).exists():
+                raise GroupNotFound()
+            if GroupMember.objects.filter(group_id=group_id, user_id=user_id).exists():
+                raise AlreadyMember()
+            raise GroupFull()
+
+        try:
+            membership = GroupMember.objects.create(
+                group_id=group_id,
+                user_id=user_id,
+                role=role
+            )
+        except IntegrityError:
+            raise AlreadyMember()
+
+        message = {
+            'group_id': membership.group_id,
+            'user_id': user_id,
+            'role': membership.role,
+            'joined_at': membership.joined_at.isoformat()
+        }
+        record_event(membership.group_id, user_id, 'joined', 'user_joined', message)
+
+    return membership
+
+
+def leave_group(group_id, user_id):
+    """
+    Marks the user's active membership as left and frees their seat.
+    Returns the left_at timestamp.
+    """
+    group_id = int(group_id)
+    with transaction.atomic():
+        left_at = timezone.now()
+        left = (
+            GroupMember.objects
+            .filter(group_id=group_id, user_id=user_id, left_at__isnull=True)
+            .update(left_at=left_at)
+        )
+        if not left:
+            if not Group.objects.filter(id=group_id).exists():
+                raise GroupNotFound('Group does not exist')
+            raise NotMember()
+
+        Group.objects.filter(id=group_id, member_count__gt=0).update(member_count=F('member_count') - 1)
+
+        message = {
+            'group_id': group_id,
+            'user_id': user_id,
+            'left_at': left_at.isoformat()
+        }
+        record_event(group_id, user_id, 'left', 'user_left', message)
+
+    return left_at
+
+
+def bulk_join(pairs, role='member'):
+    """
+    Adds many (group_id, user_id) pairs in one transaction.
+
+    The target groups are locked in id order and their remaining seats
+    worked out once, so capacity is checked for the whole batch up front.
+    Memberships, events and outbox messages are written with bulk_create,
+    and each group's counter moves with a single UPDATE.
+
+    Returns (added, rejected): the new GroupMember rows, and a list of
+    {'group_id', 'user_id', 'error'} dicts for pairs that were skipped.
+    """
+    wanted = {}
+    for group_id, user_id in pairs:
+        # Dicts keep request order while dropping duplicate pairs.
+        wanted.setdefault(int(group_id), {})[user_id] = None
+
+    rejected = []
+    with transaction.atomic():
+        groups = {
+            group.id: group
+            for group in Group.objects.select_for_update().filter(id__in=wanted).order_by('id')
+        }
+        user_ids = {user_id for users in wanted.values() for user_id in users}
+        existing = set(
+            GroupMember.objects
+            .filter(group_id__in=groups, user_id__in=user_ids)
+            .values_list('group_id', 'user_id')
+        )
+
+        added = []
+        for group_id, users in wanted.items():
+            group = groups.get(group_id)
+            seats = Group.MAX_MEMBERS - group.member_count if group else 0
+            for user_id in users:
+                if group is None:
+                    error = GroupNotFound.default_message
+                elif (group_id, user_id) in existing:
+                    error = AlreadyMember.default_message
+                elif seats <= 0:
+                    error = GroupFull.default_message
+                else:
+                    added.append(GroupMember(group_id=group_id, user_id=user_id, role=role))
+                    seats -= 1
+                    continue
+                rejected.append({'group_id': group_id, 'user_id': user_id, 'error': error})
+
+        if added:
+            added = GroupMember.objects.bulk_create(added)
+            for group_id, delta in Counter(member.group_id for member in added).items():
+                Group.objects.filter(id=group_id).update(member_count=F('member_count') + delta)
+
+            record_events(
+                (
+                    member.group_id, member.user_id, 'joined', 'user_joined',
+                    {
+                        'group_id': member.group_id,
+                        'user_id': member.user_id,
+                        'role': member.role,
+                        'joined_at': member.joined_at.isoformat()
+                    }
+                )
+                for member in added
+            )
+
+    return added, rejected
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
 
@@ -6,6 +7,8 @@ class Group(models.Model):
     """
     Represents a chat group.
     """
+    MAX_MEMBERS = 30
+
     name = models.CharField(max_length=255, unique=True)
     description = models.TextField(blank=True, null=True)
     creator_id = models.PositiveIntegerField() 
@@ -16,7 +19,7 @@ class Group(models.Model):
     member_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
-        return f"{self.name} ({self.member_count}/30)"
+        return f"{self.name} ({self.member_count}/{self.MAX_MEMBERS})"
 
 
 class GroupMember(models.Model):
@@ -37,6 +40,23 @@ class GroupMember(models.Model):
 
     class Meta:
         unique_together = ("group", "user_id") 
+        indexes = [
+            # "My groups": active memberships by user, carrying group_id for an index-only scan.
+            models.Index(
+                fields=['user_id'],
+                include=['group'],
+                name='groupmember_active_user_idx',
+                condition=Q(left_at__isnull=True),
+            ),
+            # Group roster: active members of a group in join order, covering every column the
+            # roster reads (left_at is NULL throughout, so it is neither stored nor fetched).
+            models.Index(
+                fields=['group', 'joined_at', 'id'],
+                include=['user_id', 'role'],
+                name='groupmember_roster_idx',
+                condition=Q(left_at__isnull=True),
+            ),
+        ]
 
     def __str__(self):
         return f"User {self.user_id} in {self.group.name} ({self.role})"
@@ -60,5 +80,32 @@ class GroupEvent(models.Model):
     event_type = models.CharField(max_length=20, choices=EVENT_CHOICES)
     occurred_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Serves the keyset-paginated timeline: one group, ordered by (occurred_at, id).
+            models.Index(fields=['group', 'occurred_at', 'id'], name='groupevent_timeline_idx'),
+        ]
+
     def __str__(self):
         return f"{self.event_type} - Group {self.group_id} - User {self.user_id}"
+
+
+class OutboxMessage(models.Model):
+    """
+    Kafka message waiting to be published by the outbox relay.
+    Written in the same transaction as the GroupEvent it announces.
+    """
+    topic = models.CharField(max_length=100)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    attempts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Keeps the relay's "oldest pending first" scan small once most rows are sent.
+            models.Index(fields=['id'], name='outbox_pending_idx', condition=Q(sent_at__isnull=True)),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} #{self.id} ({'sent' if self.sent_at else 'pending'})"
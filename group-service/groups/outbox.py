@@ -0,0 +1,93 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from kafka.errors import KafkaError
+from kafka_producer import get_producer
+
+from .cache import invalidate_group
+from .models import GroupEvent, OutboxMessage
+
+
+def record_event(group_id, user_id, event_type, topic, message):
+    """
+    Logs a GroupEvent and queues its Kafka message in the outbox.
+    Call inside the caller's transaction so both rows commit (or roll back)
+    together with the membership change they describe. Every event changes
+    the group's detail payload, so its cached copy is retired on commit.
+    """
+    event = GroupEvent.objects.create(
+        group_id=group_id,
+        user_id=user_id,
+        event_type=event_type
+    )
+    OutboxMessage.objects.create(topic=topic, payload=message)
+    invalidate_group(group_id)
+    return event
+
+
+def record_events(entries):
+    """
+    Bulk form of record_event for many membership changes in one transaction.
+    entries is an iterable of (group_id, user_id, event_type, topic, message).
+    """
+    entries = list(entries)
+    GroupEvent.objects.bulk_create(
+        GroupEvent(group_id=group_id, user_id=user_id, event_type=event_type)
+        for group_id, user_id, event_type, _, _ in entries
+    )
+    OutboxMessage.objects.bulk_create(
+        OutboxMessage(topic=topic, payload=message)
+        for _, _, _, topic, message in entries
+    )
+    for group_id in {entry[0] for entry in entries}:
+        invalidate_group(group_id)
+
+
+def relay_batch(batch_size=500):
+    """
+    Publishes up to batch_size pending outbox messages and marks them sent.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several relay
+    workers can run side by side without publishing the same row twice.
+    Messages the broker rejects stay pending and are retried on a later pass.
+    Returns the number of messages published.
+
+    If the producer itself fails (send() blocking past max_block_ms while the
+    broker is down, or flush() raising), the unconfirmed messages have their
+    attempts counted like rejected ones and the KafkaError is re-raised once
+    that has been committed, so the caller can back off.
+    """
+    with transaction.atomic():
+        batch = list(
+            OutboxMessage.objects
+            .select_for_update(skip_locked=True)
+            .filter(sent_at__isnull=True)
+            .order_by('id')[:batch_size]
+        )
+        if not batch:
+            return 0
+
+        futures = {}
+        error = None
+        try:
+            producer = get_producer()
+            for message in batch:
+                futures[message.id] = producer.send(message.topic, value=message.payload)
+            producer.flush()
+        except KafkaError as e:
+            error = e
+
+        sent_ids = {
+            message_id for message_id, future in futures.items()
+            if future.is_done and future.succeeded()
+        }
+        failed_ids = [message.id for message in batch if message.id not in sent_ids]
+
+        if sent_ids:
+            OutboxMessage.objects.filter(id__in=sent_ids).update(sent_at=timezone.now())
+        if failed_ids:
+            OutboxMessage.objects.filter(id__in=failed_ids).update(attempts=F('attempts') + 1)
+
+    if error is not None:
+        raise error
+    return len(sent_ids)
@@ -0,0 +1,99 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class EventKeysetPagination(BasePagination):
+    """
+    Keyset pagination over (occurred_at, id).
+
+    Pages are newest first. The `next` cursor encodes the last row returned,
+    and the following page starts strictly after it. Page N is then the same
+    index range scan as page 1, with no OFFSET.
+
+    `?since=<ISO8601>` switches to oldest first and returns only events after
+    that instant. In this mode `next` is always set once something has been
+    seen, so a polling client can keep passing it back to receive new events.
+    """
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = 'limit'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.cursor = request.query_params.get('cursor')
+        since = request.query_params.get('since')
+
+        if self.cursor:
+            self.ascending, occurred_at, pk = self.decode_cursor(self.cursor)
+            if self.ascending:
+                queryset = queryset.filter(
+                    Q(occurred_at__gte=occurred_at),
+                    Q(occurred_at__gt=occurred_at) | Q(occurred_at=occurred_at, id__gt=pk)
+                )
+            else:
+                # The redundant occurred_at bound lets the index range scan start at the cursor.
+                queryset = queryset.filter(
+                    Q(occurred_at__lte=occurred_at),
+                    Q(occurred_at__lt=occurred_at) | Q(occurred_at=occurred_at, id__lt=pk)
+                )
+        elif since:
+            since_dt = parse_datetime(since.strip())
+            if since_dt is None:
+                raise ValidationError({'since': 'Invalid format. Use ISO8601 (e.g., 2025-08-21T15:39:30Z).'})
+            self.ascending = True
+            queryset = queryset.filter(occurred_at__gt=since_dt)
+        else:
+            self.ascending = False
+
+        ordering = ('occurred_at', 'id') if self.ascending else ('-occurred_at', '-id')
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        self.has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_cursor(self):
+        if self.page and (self.has_more or self.ascending):
+            last = self.page[-1]
+            return self.encode_cursor(self.ascending, last.occurred_at, last.id)
+        if self.ascending:
+            # Nothing new yet: hand the same position back for the next poll.
+            return self.cursor
+        return None
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_cursor(),
+            'results': data,
+        })
+
+    @staticmethod
+    def encode_cursor(ascending, occurred_at, pk):
+        raw = json.dumps({'a': ascending, 'o': occurred_at.isoformat(), 'i': pk})
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            occurred_at = parse_datetime(position['o'])
+            pk = int(position['i'])
+            ascending = bool(position['a'])
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        if occurred_at is None:
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        return ascending, occurred_at, pk
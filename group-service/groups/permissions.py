@@ -0,0 +1,12 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsAdminRole(BasePermission):
+    """
+    Allows access to tokens whose `role` claim is admin or superuser.
+    """
+    message = 'Admin role required.'
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and user.get('role') in ('admin', 'superuser'))
@@ -16,6 +16,16 @@ class GroupMemberSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'joined_at', 'group', 'role', 'left_at','user_id']
 
 
+class ActiveMemberSerializer(GroupMemberSerializer):
+    """
+    Roster entry for a membership loaded without left_at, which is always
+    null for active members; reading the deferred field would cost a query.
+    """
+    left_at = serializers.SerializerMethodField()
+
+    def get_left_at(self, member):
+        return None
+
 
 class GroupEventSerializer(serializers.ModelSerializer):
     class Meta:
@@ -24,10 +34,24 @@ class GroupEventSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'group', 'user_id', 'occurred_at']
 
 class GroupListSerializer(serializers.ModelSerializer):
-    members = GroupMemberSerializer(source='group_members', many=True, read_only=True)
-    events = GroupEventSerializer(source='group_events', many=True, read_only=True)
+    """
+    Group with its active members and most recent events.
+    Expects the `active_memberships` and `recent_events` attributes
+    prefetched by views.group_queryset().
+    """
+    members = ActiveMemberSerializer(source='active_memberships', many=True, read_only=True)
+    events = GroupEventSerializer(source='recent_events', many=True, read_only=True)
 
     class Meta:
         model = Group
         fields = ['id', 'name', 'description', 'creator_id', 'created_at', 'member_count', 'members', 'events']
 
+
+
+class MembershipPairSerializer(serializers.Serializer):
+    group_id = serializers.IntegerField(min_value=1)
+    user_id = serializers.IntegerField(min_value=1)
+
+
+class BulkMembershipSerializer(serializers.Serializer):
+    memberships = MembershipPairSerializer(many=True, allow_empty=False, max_length=1000)
@@ -1,3 +1,390 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from kafka.errors import KafkaTimeoutError
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .async_views import AsyncAPIView
+from .authentication import UserDict
+from .models import Group, GroupEvent, GroupMember, OutboxMessage
+from .outbox import relay_batch
+
+
+class GroupTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def authenticate(self, user_id, role='user'):
+        self.client.force_authenticate(user=UserDict({'user_id': user_id, 'role': role}))
+
+    def create_group(self, name='Savers', creator_id=1):
+        group = Group.objects.create(name=name, creator_id=creator_id, member_count=1)
+        GroupMember.objects.create(group=group, user_id=creator_id, role='admin')
+        return group
+
+
+class OutboxTests(GroupTestCase):
+
+    def test_join_writes_event_and_outbox_message(self):
+        group = self.create_group()
+        self.authenticate(2)
+
+        response = self.client.post(reverse('group-join'), {'group_id': group.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(GroupEvent.objects.filter(group=group, user_id=2, event_type='joined').exists())
+        message = OutboxMessage.objects.get(topic='user_joined')
+        self.assertEqual(message.payload['user_id'], 2)
+        self.assertIsNone(message.sent_at)
+
+    @mock.patch('groups.outbox.get_producer')
+    def test_relay_marks_published_messages_sent(self, get_producer):
+        OutboxMessage.objects.create(topic='user_joined', payload={'user_id': 1})
+        OutboxMessage.objects.create(topic='user_left', payload={'user_id': 1})
+        producer = get_producer.return_value
+        producer.send.return_value.succeeded.return_value = True
+
+        self.assertEqual(relay_batch(batch_size=10), 2)
+
+        producer.flush.assert_called_once()
+        self.assertFalse(OutboxMessage.objects.filter(sent_at__isnull=True).exists())
+
+    @mock.patch('kafka_producer.producer.KafkaProducer')
+    def test_relay_sends_group_events_without_a_key(self, kafka_producer):
+        OutboxMessage.objects.create(topic='group_created', payload={'group_id': 1})
+        producer = kafka_producer.return_value
+        producer.send.return_value.succeeded.return_value = True
+
+        with mock.patch('kafka_producer.producer._producer', None):
+            self.assertEqual(relay_batch(batch_size=10), 1)
+
+        self.assertIsNone(producer.send.call_args.kwargs.get('key'))
+        key_serializer = kafka_producer.call_args.kwargs['key_serializer']
+        self.assertIsNone(key_serializer(None))
+        self.assertEqual(key_serializer(7), b'7')
+
+    @mock.patch('groups.outbox.get_producer')
+    def test_relay_keeps_failed_messages_pending(self, get_producer):
+        message = OutboxMessage.objects.create(topic='user_joined', payload={'user_id': 1})
+        get_producer.return_value.send.return_value.succeeded.return_value = False
+
+        self.assertEqual(relay_batch(batch_size=10), 0)
+
+        message.refresh_from_db()
+        self.assertIsNone(message.sent_at)
+        self.assertEqual(message.attempts, 1)
+
+    @mock.patch('groups.outbox.get_producer')
+    def test_relay_counts_attempts_when_the_broker_is_down(self, get_producer):
+        message = OutboxMessage.objects.create(topic='user_joined', payload={'user_id': 1})
+        get_producer.return_value.send.side_effect = KafkaTimeoutError()
+
+        with self.assertRaises(KafkaTimeoutError):
+            relay_batch(batch_size=10)
+
+        message.refresh_from_db()
+        self.assertIsNone(message.sent_at)
+        self.assertEqual(message.attempts, 1)
+
+
+class MembershipTests(GroupTestCase):
+
+    def test_join_increments_member_count(self):
+        group = self.create_group()
+        self.authenticate(2)
+
+        response = self.client.post(reverse('group-join'), {'group_id': group.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        group.refresh_from_db()
+        self.assertEqual(group.member_count, 2)
+
+    def test_join_rejects_duplicate_without_touching_counter(self):
+        group = self.create_group()
+        self.authenticate(1)
+
+        response = self.client.post(reverse('group-join'), {'group_id': group.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'User already a member')
+        group.refresh_from_db()
+        self.assertEqual(group.member_count, 1)
+
+    def test_join_rejects_full_group(self):
+        group = self.create_group()
+        GroupMember.objects.bulk_create(
+            GroupMember(group=group, user_id=user_id) for user_id in range(2, Group.MAX_MEMBERS + 1)
+        )
+        Group.objects.filter(id=group.id).update(member_count=Group.MAX_MEMBERS)
+        self.authenticate(999)
+
+        response = self.client.post(reverse('group-join'), {'group_id': group.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Group is full')
+        self.assertFalse(GroupMember.objects.filter(group=group, user_id=999).exists())
+
+    def test_join_unknown_group(self):
+        self.authenticate(1)
+
+        response = self.client.post(reverse('group-join'), {'group_id': 12345}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_leave_frees_seat(self):
+        group = self.create_group()
+        self.authenticate(1)
+
+        response = self.client.post(reverse('group-leave'), {'group_id': group.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        group.refresh_from_db()
+        self.assertEqual(group.member_count, 0)
+        self.assertIsNotNone(GroupMember.objects.get(group=group, user_id=1).left_at)
+
+        response = self.client.post(reverse('group-leave'), {'group_id': group.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class GroupQueryBudgetTests(GroupTestCase):
+
+    def seed_groups(self, count, user_id=1):
+        start = Group.objects.count()
+        for i in range(start, start + count):
+            group = self.create_group(name=f"Group {i}", creator_id=user_id)
+            GroupMember.objects.create(group=group, user_id=100 + i)
+            GroupEvent.objects.bulk_create(
+                GroupEvent(group=group, user_id=user_id, event_type='joined') for _ in range(5)
+            )
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('group-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx), response
+
+    def test_list_query_count_is_constant(self):
+        self.authenticate(1)
+        self.seed_groups(1)
+        few, _ = self.count_list_queries()
+
+        self.seed_groups(10)
+        many, response = self.count_list_queries()
+
+        self.assertEqual(few, many)
+        self.assertEqual(many, 3)
+        self.assertEqual(len(response.data), 11)
+
+    def test_list_excludes_groups_the_user_left(self):
+        group = self.create_group()
+        GroupMember.objects.filter(group=group, user_id=1).update(left_at=group.created_at)
+        self.authenticate(1)
+
+        _, response = self.count_list_queries()
+
+        self.assertEqual(response.data, [])
+
+    @override_settings(GROUP_RECENT_EVENTS_LIMIT=3)
+    def test_detail_embeds_active_members_and_recent_events(self):
+        group = self.create_group()
+        GroupMember.objects.create(group=group, user_id=2, left_at=group.created_at)
+        GroupEvent.objects.bulk_create(
+            GroupEvent(group=group, user_id=1, event_type='joined') for _ in range(10)
+        )
+        self.authenticate(1)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('group-detail', args=[group.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([m['user_id'] for m in response.data['members']], [1])
+        self.assertEqual(len(response.data['events']), 3)
+
+
+class GroupEventTimelineTests(GroupTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.group = self.create_group()
+        self.authenticate(1)
+        base = timezone.now() - timedelta(hours=1)
+        events = GroupEvent.objects.bulk_create(
+            GroupEvent(group=self.group, user_id=i, event_type='joined') for i in range(7)
+        )
+        # Pairs of events share a timestamp so the id tie-breaker is exercised.
+        for i, event in enumerate(events):
+            GroupEvent.objects.filter(id=event.id).update(occurred_at=base + timedelta(minutes=i // 2))
+        self.url = reverse('group-events', args=[self.group.id])
+
+    def test_pages_walk_the_timeline_newest_first(self):
+        seen = []
+        params = {'limit': 3}
+        while True:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(event['id'] for event in response.data['results'])
+            if not response.data['next']:
+                break
+            params = {'limit': 3, 'cursor': response.data['next']}
+
+        expected = list(
+            GroupEvent.objects.filter(group=self.group)
+            .order_by('-occurred_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_since_polls_for_new_events(self):
+        since = GroupEvent.objects.filter(group=self.group).order_by('-occurred_at').first().occurred_at
+        response = self.client.get(self.url, {'since': since.isoformat()})
+        self.assertEqual(response.data['results'], [])
+
+        new = GroupEvent.objects.create(group=self.group, user_id=50, event_type='left')
+        response = self.client.get(self.url, {'since': since.isoformat()})
+        self.assertEqual([event['id'] for event in response.data['results']], [new.id])
+
+        cursor = response.data['next']
+        response = self.client.get(self.url, {'cursor': cursor})
+        self.assertEqual(response.data['results'], [])
+        self.assertEqual(response.data['next'], cursor)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class GroupDetailCacheTests(GroupTestCase):
+
+    def test_detail_is_served_from_cache(self):
+        group = self.create_group()
+        self.authenticate(1)
+        url = reverse('group-detail', args=[group.id])
+
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+
+        self.assertEqual(first.data, second.data)
+        stats = self.client.get(reverse('group-cache-stats')).data
+        self.assertGreaterEqual(stats['hits'], 1)
+        self.assertGreaterEqual(stats['misses'], 1)
+
+    def test_join_invalidates_cached_detail(self):
+        group = self.create_group()
+        self.authenticate(2)
+        url = reverse('group-detail', args=[group.id])
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('group-join'), {'group_id': group.id}, format='json')
+        response = self.client.get(url)
+
+        self.assertEqual(response.data['member_count'], 2)
+        self.assertEqual(sorted(m['user_id'] for m in response.data['members']), [1, 2])
+
+    def test_missing_group_is_not_cached(self):
+        self.authenticate(1)
+
+        response = self.client.get(reverse('group-detail', args=[404404]))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIsNone(cache.get('group:404404:version'))
+
+
+class BulkJoinTests(GroupTestCase):
+
+    def test_requires_admin_role(self):
+        group = self.create_group()
+        self.authenticate(1)
+
+        response = self.client.post(reverse('group-bulk-join'), {
+            'memberships': [{'group_id': group.id, 'user_id': 2}]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_join_respects_capacity_and_duplicates(self):
+        roomy = self.create_group(name='Roomy')
+        nearly_full = self.create_group(name='Nearly full')
+        Group.objects.filter(id=nearly_full.id).update(member_count=Group.MAX_MEMBERS - 1)
+        self.authenticate(1, role='admin')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('group-bulk-join'), {
+                'memberships': [
+                    {'group_id': roomy.id, 'user_id': 2},
+                    {'group_id': roomy.id, 'user_id': 3},
+                    {'group_id': roomy.id, 'user_id': 1},
+                    {'group_id': nearly_full.id, 'user_id': 2},
+                    {'group_id': nearly_full.id, 'user_id': 3},
+                    {'group_id': 404404, 'user_id': 2},
+                ]
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted((m['group'], m['user_id']) for m in response.data['added']),
+            sorted([(roomy.id, 2), (roomy.id, 3), (nearly_full.id, 2)])
+        )
+        self.assertEqual(
+            sorted(r['error'] for r in response.data['rejected']),
+            ['Group is full', 'Group not found', 'User already a member']
+        )
+        roomy.refresh_from_db()
+        nearly_full.refresh_from_db()
+        self.assertEqual(roomy.member_count, 3)
+        self.assertEqual(nearly_full.member_count, Group.MAX_MEMBERS)
+        self.assertEqual(OutboxMessage.objects.filter(topic='user_joined').count(), 3)
+        self.assertEqual(GroupEvent.objects.filter(event_type='joined').count(), 3)
+
+
+@skipUnless(connection.vendor == 'postgresql', "EXPLAIN checks need PostgreSQL")
+class MembershipIndexTests(GroupTestCase):
+
+    def test_membership_queries_use_indexes(self):
+        out = StringIO()
+
+        call_command('explain_membership_indexes', groups=2000, users=20000, stdout=out)
+
+        self.assertIn('All membership queries use their indexes', out.getvalue())
+
+
+class AsyncViewTests(GroupTestCase):
+
+    def async_authenticate(self, user_id):
+        patcher = mock.patch.object(
+            AsyncAPIView.authentication, 'authenticate',
+            return_value=(UserDict({'user_id': user_id}), 'token')
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_async_join_and_list(self):
+        group = await Group.objects.acreate(name='Async', creator_id=1, member_count=1)
+        await GroupMember.objects.acreate(group=group, user_id=1, role='admin')
+        self.async_authenticate(2)
+
+        response = await self.async_client.post(
+            reverse('async-group-join'), {'group_id': group.id}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = await self.async_client.get(reverse('async-group-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([g['id'] for g in response.json()], [group.id])
+        self.assertEqual(sorted(m['user_id'] for m in response.json()[0]['members']), [1, 2])
+
+    async def test_async_views_require_token(self):
+        response = await self.async_client.get(reverse('async-group-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
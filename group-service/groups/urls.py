@@ -3,14 +3,20 @@ from .views import (
     GroupCreationView,
     GroupJoinView,
     GroupLeaveView,
+    GroupBulkJoinView,
     GroupListView,
     GroupDetailView,
+    GroupEventTimelineView,
+    GroupCacheStatsView,
 )
 
 urlpatterns = [
     path('groups/create/', GroupCreationView.as_view(), name='group-create'),
     path('groups/join/', GroupJoinView.as_view(), name='group-join'),
     path('groups/leave/', GroupLeaveView.as_view(), name='group-leave'),
+    path('groups/members/bulk/', GroupBulkJoinView.as_view(), name='group-bulk-join'),
     path('groups/', GroupListView.as_view(), name='group-list'),
-    path('groups/<uuid:group_id>/', GroupDetailView.as_view(), name='group-detail'),
+    path('groups/cache-stats/', GroupCacheStatsView.as_view(), name='group-cache-stats'),
+    path('groups/<int:group_id>/', GroupDetailView.as_view(), name='group-detail'),
+    path('groups/<int:group_id>/events/', GroupEventTimelineView.as_view(), name='group-events'),
 ]
\ No newline at end of file
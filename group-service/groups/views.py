@@ -1,23 +1,59 @@
 # views.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Prefetch
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from .serializers import GroupSerializer, GroupMemberSerializer, GroupListSerializer
+from .serializers import (
+    GroupSerializer,
+    GroupMemberSerializer,
+    GroupListSerializer,
+    GroupEventSerializer,
+    BulkMembershipSerializer,
+)
+from .cache import get_group_detail, get_stats
 from .models import Group, GroupMember, GroupEvent
-from kafka import KafkaProducer
-import json
-from datetime import datetime
+from .membership import GroupNotFound, MembershipError, bulk_join, create_group, join_group, leave_group
+from .pagination import EventKeysetPagination
+from .permissions import IsAdminRole
 # Import the custom authentication class
 from .authentication import JWTAuthentication
 
+
+def group_queryset():
+    """
+    Groups with active memberships and a bounded window of recent events
+    prefetched, so serializing any number of groups costs three queries.
+    The occurred_at bound lets Postgres prune old event partitions.
+    """
+    events_since = timezone.now() - timedelta(days=settings.GROUP_RECENT_EVENTS_DAYS)
+    return Group.objects.prefetch_related(
+        Prefetch(
+            'memberships',
+            # Only the roster index's columns, so Postgres can answer from the index alone.
+            queryset=GroupMember.objects.filter(left_at__isnull=True)
+            .only('id', 'group_id', 'user_id', 'role', 'joined_at').order_by('joined_at', 'id'),
+            to_attr='active_memberships',
+        ),
+        Prefetch(
+            'events',
+            queryset=GroupEvent.objects.filter(occurred_at__gte=events_since)
+            .order_by('-occurred_at', '-id')[:settings.GROUP_RECENT_EVENTS_LIMIT],
+            to_attr='recent_events',
+        ),
+    )
+
+
 class GroupCreationView(APIView):
     """
     Handles group creation. 
     - Creates a Group.
     - Adds the creator as an admin member.
     - Logs event in GroupEvent.
-    - Publishes group_created event to Kafka.
+    - Queues a group_created event in the Kafka outbox.
     """
     authentication_classes = [JWTAuthentication]
 
@@ -25,40 +61,7 @@ class GroupCreationView(APIView):
         serializer = GroupSerializer(data=request.data)
         if serializer.is_valid():
             # request.user.id is now available
-            group = serializer.save(
-                creator_id=request.user.id,
-                member_count=1
-            )
-
-            GroupMember.objects.create(
-                group=group,
-                user_id=request.user.id,
-                role='admin'
-            )
-
-            GroupEvent.objects.create(
-                group=group,
-                user_id=request.user.id,
-                event_type='created'
-            )
-
-            try:
-                producer = KafkaProducer(
-                    bootstrap_servers='kafka:9092',
-                    value_serializer=lambda v: json.dumps(v).encode('utf-8')
-                )
-
-                message = {
-                    'group_id': group.id,
-                    'name': group.name,
-                    'creator_id': group.creator_id,
-                    'created_at': group.created_at.isoformat(),
-                }
-
-                producer.send('group_created', value=message)
-                producer.flush()
-            except Exception as e:
-                print(f"⚠️ Kafka error: {e}")
+            group = create_group(request.user.id, **serializer.validated_data)
 
             return Response(GroupSerializer(group).data, status=status.HTTP_201_CREATED)
 
@@ -67,10 +70,10 @@ class GroupCreationView(APIView):
 class GroupJoinView(APIView):
     """
     Handles joining a group.
-    - Checks if group exists and is not full (limit 30).
+    - Atomically claims a seat if the group exists and is not full (limit 30).
     - Adds user as a member.
     - Logs join event.
-    - Publishes user_joined event to Kafka.
+    - Queues a user_joined event in the Kafka outbox.
     """
     authentication_classes = [JWTAuthentication]
 
@@ -80,50 +83,13 @@ class GroupJoinView(APIView):
         if not group_id:
             return Response({'error': 'group_id is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            group_obj = Group.objects.get(id=group_id)
-        except Group.DoesNotExist:
-            return Response({'error': 'Group not found'}, status=status.HTTP_404_NOT_FOUND)
-
         # request.user.id is now available
-        if GroupMember.objects.filter(group=group_obj, user_id=request.user.id).exists():
-            return Response({'error': 'User already a member'}, status=status.HTTP_400_BAD_REQUEST)
-
-        if group_obj.member_count >= 30:
-            return Response({'error': 'Group is full'}, status=status.HTTP_400_BAD_REQUEST)
-
-        join = GroupMember.objects.create(
-            group=group_obj,
-            user_id=request.user.id,
-            role='member'
-        )
-
-        group_obj.member_count += 1
-        group_obj.save()
-
-        GroupEvent.objects.create(
-            group=group_obj,
-            user_id=request.user.id,
-            event_type='joined'
-        )
-
         try:
-            producer = KafkaProducer(
-                bootstrap_servers='kafka:9092',
-                value_serializer=lambda v: json.dumps(v).encode('utf-8')
-            )
-
-            message = {
-                'group_id': group_obj.id,
-                'user_id': request.user.id,
-                'role': join.role,
-                'joined_at': join.joined_at.isoformat()
-            }
-
-            producer.send('user_joined', value=message)
-            producer.flush()
-        except Exception as e:
-            print(f"⚠️ Kafka error: {e}")
+            join = join_group(group_id, request.user.id)
+        except GroupNotFound as e:
+            return Response({'error': e.message}, status=status.HTTP_404_NOT_FOUND)
+        except MembershipError as e:
+            return Response({'error': e.message}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(GroupMemberSerializer(join).data, status=status.HTTP_201_CREATED)
 
@@ -135,7 +101,7 @@ class GroupLeaveView(APIView):
     - Marks the member as left (sets left_at).
     - Decreases member_count.
     - Logs event.
-    - Publishes user_left event to Kafka.
+    - Queues a user_left event in the Kafka outbox.
     """
     authentication_classes = [JWTAuthentication]
 
@@ -144,63 +110,56 @@ class GroupLeaveView(APIView):
 
         if not group_id:
             return Response({'error': 'group_id is required'}, status=status.HTTP_400_BAD_REQUEST)
-      
-        try:
-            group_obj = Group.objects.get(id=group_id)
-        except Group.DoesNotExist:
-            return Response({'error': 'Group does not exist'}, status=status.HTTP_404_NOT_FOUND)
 
         # request.user.id is now available
         try:
-            membership = GroupMember.objects.get(group=group_obj, user_id=request.user.id, left_at__isnull=True)
-        except GroupMember.DoesNotExist:
-            return Response({'error': 'User is not a member of this group'}, status=status.HTTP_400_BAD_REQUEST)
+            leave_group(group_id, request.user.id)
+        except GroupNotFound as e:
+            return Response({'error': e.message}, status=status.HTTP_404_NOT_FOUND)
+        except MembershipError as e:
+            return Response({'error': e.message}, status=status.HTTP_400_BAD_REQUEST)
 
-        membership.left_at = timezone.now()
-        membership.save()
+        return Response({'message': 'Successfully left group'}, status=status.HTTP_200_OK)
 
-        if group_obj.member_count > 0:
-            group_obj.member_count -= 1
-            group_obj.save()
 
-        GroupEvent.objects.create(
-            group=group_obj,
-            user_id=request.user.id,
-            event_type='left'
-        )
+class GroupBulkJoinView(APIView):
+    """
+    Adds many users to groups in one request (admin only).
+    - Validates capacity for every target group in one pass.
+    - Bulk inserts memberships, events and outbox messages.
+    - Applies one member_count update per group.
+    Returns the memberships added and the pairs rejected, with reasons.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdminRole]
 
-        try:
-            producer = KafkaProducer(
-                bootstrap_servers='kafka:9092',
-                value_serializer=lambda v: json.dumps(v).encode('utf-8')
-            )
-
-            message = {
-                'group_id': group_obj.id,
-                'user_id': request.user.id,
-                'left_at': membership.left_at.isoformat()
-            }
-
-            producer.send('user_left', value=message)
-            producer.flush()
-        except Exception as e:
-            print(f"⚠️ Kafka error: {e}")
+    def post(self, request):
+        serializer = BulkMembershipSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response({'message': 'Successfully left group'}, status=status.HTTP_200_OK)
+        pairs = [(pair['group_id'], pair['user_id']) for pair in serializer.validated_data['memberships']]
+        added, rejected = bulk_join(pairs)
+
+        return Response({
+            'added': GroupMemberSerializer(added, many=True).data,
+            'rejected': rejected,
+        }, status=status.HTTP_200_OK)
 
 
 class GroupListView(APIView):
     """
     Returns all groups the current user is a member of,
-    along with group details and members/events.
+    along with group details, active members and recent events.
     """
     authentication_classes = [JWTAuthentication]
 
     def get(self, request):
         # request.user.id is now available
-        memberships = GroupMember.objects.filter(user_id=request.user.id)
-
-        groups = Group.objects.filter(id__in=memberships.values_list('group_id', flat=True))
+        groups = group_queryset().filter(
+            memberships__user_id=request.user.id,
+            memberships__left_at__isnull=True
+        ).order_by('id')
 
         serializer = GroupListSerializer(groups, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -208,15 +167,47 @@ class GroupListView(APIView):
 
 class GroupDetailView(APIView):
     """
-    Returns details of a single group, including members and events.
+    Returns details of a single group, including active members and recent events.
+    Served from cache until a create/join/leave for the group commits.
     """
     authentication_classes = [JWTAuthentication]
 
     def get(self, request, group_id):
+        def build():
+            return GroupListSerializer(group_queryset().get(id=group_id)).data
+
         try:
-            group = Group.objects.get(id=group_id)
+            payload = get_group_detail(group_id, build)
         except Group.DoesNotExist:
             return Response({'error': 'Group not found'}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = GroupListSerializer(group)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(payload, status=status.HTTP_200_OK)
+
+
+class GroupEventTimelineView(APIView):
+    """
+    Returns a group's event history, newest first, one keyset page at a time.
+    Pass `cursor` from the previous page to continue, or `since` to poll for
+    events after a point in time.
+    """
+    authentication_classes = [JWTAuthentication]
+    pagination_class = EventKeysetPagination
+
+    def get(self, request, group_id):
+        if not Group.objects.filter(id=group_id).exists():
+            return Response({'error': 'Group not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(GroupEvent.objects.filter(group_id=group_id), request, view=self)
+        serializer = GroupEventSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class GroupCacheStatsView(APIView):
+    """
+    Returns this worker's group detail cache hit/miss counters.
+    """
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request):
+        return Response(get_stats(), status=status.HTTP_200_OK)
@@ -0,0 +1,152 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import AccountBalance, BalanceSnapshot, LedgerEntry
+from .rollups import record_entry
+
+ZERO = Decimal('0.00')
+
+
+class LedgerError(Exception):
+    """
+    Base class for posting failures. Carries the API error message.
+    """
+    default_message = 'Ledger entry rejected'
+
+    def __init__(self, message=None):
+        self.message = message or self.default_message
+        super().__init__(self.message)
+
+
+class InsufficientFunds(LedgerError):
+    default_message = 'Insufficient funds'
+
+
+class IdempotencyKeyReused(LedgerError):
+    default_message = 'Idempotency-Key was already used for a different request'
+
+
+def _apply(account_holder, signed, now):
+    """
+    Moves the balance by `signed` in one conditional UPDATE:
+
+        UPDATE ... SET balance = balance + signed, entry_count = entry_count + 1
+        WHERE account_holder = ... AND balance >= -signed
+
+    The database checks the guard and applies the change under the row lock,
+    so concurrent writers can neither lose an update nor overdraw. Returns
+    False when the guard fails or the holder has no balance row yet.
+    """
+    guard = Q(balance__gte=-signed) if signed < 0 else Q()
+    return AccountBalance.objects.filter(guard, account_holder=account_holder).update(
+        balance=F('balance') + signed,
+        entry_count=F('entry_count') + 1,
+        # Never behind the previous entry, even if this server's clock is.
+        updated_at=Greatest(Coalesce(F('updated_at'), Value(now)), Value(now)),
+    ) == 1
+
+
+def _replay(account_holder, kind, amount, idempotency_key):
+    entry = LedgerEntry.objects.filter(account_holder=account_holder, idempotency_key=idempotency_key).first()
+    if entry is not None and (entry.kind, entry.amount) != (kind, amount):
+        raise IdempotencyKeyReused()
+    return entry
+
+
+def post_entry(account_holder, kind, amount, description='', idempotency_key=None):
+    """
+    Appends a deposit or withdrawal and returns (entry, balance, replayed).
+
+    The balance moves first, through _apply's guarded UPDATE; the row it
+    locks then numbers the entry and orders created_at until commit. Every
+    SAVINGS_SNAPSHOT_INTERVAL-th entry also records a BalanceSnapshot, and
+    every entry is added to the holder's day, week and month rollups.
+
+    With an idempotency_key, a holder's retry of an earlier post returns the
+    original entry and the current balance with replayed=True. Two retries
+    racing each other both apply, but the second trips the unique key, rolls
+    back its balance change with the rest of its transaction and replays.
+    """
+    if idempotency_key:
+        entry = _replay(account_holder, kind, amount, idempotency_key)
+        if entry is not None:
+            return entry, current_balance(account_holder), True
+
+    signed = amount if kind == LedgerEntry.DEPOSIT else -amount
+    try:
+        with transaction.atomic():
+            now = timezone.now()
+            if not _apply(account_holder, signed, now):
+                # Only the failure path pays for working out why.
+                if signed < 0 or AccountBalance.objects.filter(account_holder=account_holder).exists():
+                    raise InsufficientFunds()
+                # First deposit for this holder; get_or_create absorbs a concurrent one.
+                AccountBalance.objects.get_or_create(account_holder=account_holder)
+                _apply(account_holder, signed, now)
+
+            # Our own uncommitted row: nobody else can change it before we commit.
+            state = AccountBalance.objects.get(account_holder=account_holder)
+            entry = LedgerEntry.objects.create(
+                account_holder=account_holder, sequence=state.entry_count, kind=kind, amount=amount,
+                description=description, idempotency_key=idempotency_key or None, created_at=state.updated_at,
+            )
+            record_entry(entry, state.balance)
+            if state.entry_count % settings.SAVINGS_SNAPSHOT_INTERVAL == 0:
+                BalanceSnapshot.objects.create(
+                    account_holder=account_holder, sequence=state.entry_count,
+                    balance=state.balance, as_of=state.updated_at,
+                )
+    except IntegrityError:
+        if not idempotency_key:
+            raise
+        entry = _replay(account_holder, kind, amount, idempotency_key)
+        if entry is None:
+            raise
+        return entry, current_balance(account_holder), True
+
+    return entry, state.balance, False
+
+
+def current_balance(account_holder):
+    """
+    One primary key lookup; holders with no entries have a zero balance.
+    """
+    balance = AccountBalance.objects.filter(account_holder=account_holder).values_list('balance', flat=True).first()
+    return ZERO if balance is None else balance
+
+
+def balance_at(account_holder, at):
+    """
+    The balance after every entry created at or before `at`: the latest
+    snapshot taken by then plus the entries posted since it, at most
+    SAVINGS_SNAPSHOT_INTERVAL of them.
+    """
+    state = AccountBalance.objects.filter(account_holder=account_holder).values('balance', 'updated_at').first()
+    if state is None:
+        return ZERO
+    if state['updated_at'] <= at:
+        return state['balance']
+
+    entries = LedgerEntry.objects.filter(account_holder=account_holder, created_at__lte=at)
+    base = ZERO
+    snapshot = (
+        BalanceSnapshot.objects
+        .filter(account_holder=account_holder, as_of__lte=at)
+        .order_by('-as_of', '-sequence')
+        .first()
+    )
+    if snapshot is not None:
+        base = snapshot.balance
+        # created_at follows sequence, so the bound keeps the scan inside this window.
+        entries = entries.filter(created_at__gte=snapshot.as_of, sequence__gt=snapshot.sequence)
+
+    totals = entries.aggregate(
+        deposits=Sum('amount', filter=Q(kind=LedgerEntry.DEPOSIT)),
+        withdrawals=Sum('amount', filter=Q(kind=LedgerEntry.WITHDRAWAL)),
+    )
+    return base + (totals['deposits'] or ZERO) - (totals['withdrawals'] or ZERO)
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from savings.models import AccountBalance
+from savings.rollups import rebuild_holder
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds day, week and month rollups from the existing ledger, one "
+        "holder at a time. Each holder is rebuilt in its own transaction "
+        "holding their balance row lock, so it is safe to run while deposits "
+        "and withdrawals are being posted. Holders are processed in id order; "
+        "pass --after to resume after the last holder reported."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help="Holders fetched per batch (also the entry fetch and insert size).")
+        parser.add_argument('--after', type=int, default=0,
+                            help="Start after this account_holder id.")
+        parser.add_argument('--holder', type=int, action='append',
+                            help="Only rebuild these holders (repeatable).")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        started = time.perf_counter()
+        holders_done = buckets = 0
+
+        if options['holder']:
+            batches = [sorted(options['holder'])]
+        else:
+            batches = self.holder_batches(options['after'], chunk_size)
+
+        for holders in batches:
+            for holder in holders:
+                with transaction.atomic():
+                    buckets += rebuild_holder(holder, chunk_size=chunk_size)
+            holders_done += len(holders)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{holders_done} holders, {buckets} buckets, up to holder {holders[-1]} "
+                              f"({holders_done / elapsed:.0f} holders/s)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt rollups for {holders_done} holders ({buckets} buckets) in {time.perf_counter() - started:.1f}s"
+        ))
+
+    def holder_batches(self, after, chunk_size):
+        # Keyset over the balance table: every holder with entries has a row.
+        while True:
+            holders = list(
+                AccountBalance.objects
+                .filter(account_holder__gt=after)
+                .order_by('account_holder')
+                .values_list('account_holder', flat=True)[:chunk_size]
+            )
+            if not holders:
+                return
+            yield holders
+            after = holders[-1]
@@ -0,0 +1,91 @@
+import json
+import resource
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from savings.authentication import UserDict
+from savings.models import SavingsAccount
+from savings.serializers import SavingsAccountSerializer
+from savings.views import SavingsAccountExportView
+
+
+class Rollback(Exception):
+    pass
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams a large savings history through the export endpoint and "
+        "reports throughput and peak RSS. Rows are seeded inside a transaction "
+        "that is rolled back, unless --rows 0 exports an existing holder. "
+        "--compare then builds the same export the way the list endpoints do "
+        "(serializer.data in memory) to show the difference in peak memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2_000_000)
+        parser.add_argument('--holder', type=int, default=987_654_321)
+        parser.add_argument('--type', choices=['ndjson', 'csv'], default='ndjson')
+        parser.add_argument('--compare', action='store_true',
+                            help="Also materialize the export in memory (run last: peak RSS only grows).")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['rows']:
+                    self.seed(options)
+                self.bench(options)
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def seed(self, options):
+        started = time.perf_counter()
+        for start in range(0, options['rows'], 10_000):
+            SavingsAccount.objects.bulk_create(
+                SavingsAccount(account_holder=options['holder'], balance=Decimal(n % 10_000) / 100)
+                for n in range(start, min(start + 10_000, options['rows']))
+            )
+        self.stdout.write(f"Seeded {options['rows']} rows in {time.perf_counter() - started:.1f}s "
+                          f"(peak RSS {peak_rss_mb():.0f} MB)")
+
+    def bench(self, options):
+        request = APIRequestFactory().get('/api/savings/export/', {'type': options['type']})
+        force_authenticate(request, user=UserDict({'user_id': options['holder'], 'role': 'user'}))
+        before = peak_rss_mb()
+
+        started = time.perf_counter()
+        response = SavingsAccountExportView.as_view()(request)
+        first_byte, size, lines = None, 0, 0
+        for chunk in response.streaming_content:
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            size += len(chunk)
+            lines += chunk.count(b'\n')
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"streamed {lines} lines ({size / 2 ** 20:.1f} MB {options['type']}) in {elapsed:.1f}s: "
+            f"{lines / elapsed:.0f} rows/s, first byte after {(first_byte or 0) * 1000:.0f} ms, "
+            f"peak RSS {before:.0f} -> {peak_rss_mb():.0f} MB"
+        )
+
+        if options['compare']:
+            before = peak_rss_mb()
+            started = time.perf_counter()
+            queryset = SavingsAccount.objects.filter(account_holder=options['holder']).order_by('-created_at', '-id')
+            body = json.dumps(SavingsAccountSerializer(queryset, many=True).data)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"materialized {len(body) / 2 ** 20:.1f} MB in {elapsed:.1f}s, "
+                f"peak RSS {before:.0f} -> {peak_rss_mb():.0f} MB"
+            )
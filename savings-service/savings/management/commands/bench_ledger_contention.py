@@ -0,0 +1,97 @@
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+
+from savings.ledger import InsufficientFunds, post_entry
+from savings.models import AccountBalance, BalanceSnapshot, LedgerEntry, SavingsRollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Fires many concurrent deposits and withdrawals at one holder, retrying "
+        "a share of them with the same idempotency key, and checks that the "
+        "balance never went negative, matches the ledger, and that no retry "
+        "was applied twice."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--workers', type=int, default=64,
+                            help="Concurrent threads, each with its own DB connection.")
+        parser.add_argument('--retry-rate', type=float, default=0.2,
+                            help="Share of posts sent a second time with the same key.")
+        parser.add_argument('--holder', type=int, default=2_000_000_000)
+        parser.add_argument('--keep', action='store_true',
+                            help="Keep the benchmark holder's ledger instead of deleting it.")
+
+    def _post(self, holder, kind, amount, key):
+        # One connection per attempt, like a request with CONN_MAX_AGE=0.
+        try:
+            _, _, replayed = post_entry(holder, kind, amount, idempotency_key=key)
+            return 'replayed' if replayed else kind
+        except InsufficientFunds:
+            return 'insufficient'
+        finally:
+            connection.close()
+
+    def handle(self, *args, **options):
+        holder = options['holder']
+        if AccountBalance.objects.filter(account_holder=holder).exists():
+            raise CommandError(f"Holder {holder} already has a ledger; pick another --holder")
+
+        rng = random.Random(0)
+        posts = []
+        for _ in range(options['posts']):
+            kind = LedgerEntry.DEPOSIT if rng.random() < 0.5 else LedgerEntry.WITHDRAWAL
+            post = (kind, Decimal(rng.randint(1, 5000)) / 100, uuid.uuid4().hex)
+            posts.append(post)
+            if rng.random() < options['retry_rate']:
+                posts.append(post)
+        rng.shuffle(posts)
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            outcomes = list(pool.map(lambda post: self._post(holder, *post), posts))
+        elapsed = time.monotonic() - started
+
+        entries = list(LedgerEntry.objects.filter(account_holder=holder).order_by('sequence'))
+        balance = AccountBalance.objects.get(account_holder=holder)
+        running, lowest = Decimal('0'), Decimal('0')
+        for entry in entries:
+            running += entry.signed_amount
+            lowest = min(lowest, running)
+        applied = {post[2] for post, outcome in zip(posts, outcomes) if outcome in ('deposit', 'withdrawal')}
+        keys = [entry.idempotency_key for entry in entries]
+
+        self.stdout.write(f"{len(posts)} posts ({len(posts) - options['posts']} retries), "
+                          f"{options['workers']} workers: {elapsed:.2f}s ({len(posts) / elapsed:.0f} posts/s)")
+        self.stdout.write(
+            f"deposits={outcomes.count('deposit')} withdrawals={outcomes.count('withdrawal')} "
+            f"insufficient={outcomes.count('insufficient')} replayed={outcomes.count('replayed')} "
+            f"balance={balance.balance} ledger_total={running} lowest_running_balance={lowest}"
+        )
+
+        if not options['keep']:
+            # Ledger querysets refuse to delete; a plain one is fine for benchmark rows.
+            models.QuerySet(LedgerEntry).filter(account_holder=holder).delete()
+            BalanceSnapshot.objects.filter(account_holder=holder).delete()
+            SavingsRollup.objects.filter(account_holder=holder).delete()
+            balance.delete()
+
+        problems = []
+        if balance.balance != running:
+            problems.append("balance does not match the ledger")
+        if lowest < 0:
+            problems.append("the balance went negative")
+        if [entry.sequence for entry in entries] != list(range(1, len(entries) + 1)):
+            problems.append("entry sequence has gaps or duplicates")
+        if len(keys) != len(set(keys)) or set(keys) != applied:
+            problems.append("an idempotency key was applied more or less than once")
+        if problems:
+            raise CommandError("; ".join(problems))
+        self.stdout.write(self.style.SUCCESS("No lost updates, overdrafts or double-applied retries"))
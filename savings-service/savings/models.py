@@ -14,6 +14,154 @@ class SavingsAccount(models.Model):
         verbose_name_plural = "Savings Accounts"
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['account_holder']),
+            # Serves the per-holder list and date-range search in keyset order;
+            # it also covers plain account_holder lookups.
+            models.Index(fields=['account_holder', '-created_at', '-id'], name='savings_holder_created_idx'),
             models.Index(fields=['-created_at']),
         ]
+
+
+class LedgerEntryQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        raise TypeError("Ledger entries are immutable; post a correcting entry instead.")
+
+    def delete(self):
+        raise TypeError("Ledger entries are immutable; post a correcting entry instead.")
+
+
+class LedgerEntry(models.Model):
+    """
+    One deposit or withdrawal. Entries are append-only: a mistake is fixed by
+    posting the opposite entry. `sequence` numbers a holder's entries 1, 2, ...
+    in posting order; `amount` is always positive and `kind` gives the sign.
+    """
+    DEPOSIT = 'deposit'
+    WITHDRAWAL = 'withdrawal'
+    KIND_CHOICES = [
+        (DEPOSIT, 'Deposit'),
+        (WITHDRAWAL, 'Withdrawal'),
+    ]
+
+    account_holder = models.PositiveIntegerField()
+    sequence = models.PositiveBigIntegerField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    description = models.CharField(max_length=255, blank=True)
+    # Client-chosen key (Idempotency-Key header); a retry with the same key
+    # returns the original entry instead of posting again.
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True)
+    # Set under the holder's balance lock and never earlier than the previous
+    # entry, so created_at order matches sequence order.
+    created_at = models.DateTimeField()
+
+    objects = LedgerEntryQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.account_holder} #{self.sequence} {self.kind} {self.amount}"
+
+    @property
+    def signed_amount(self):
+        return self.amount if self.kind == self.DEPOSIT else -self.amount
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise TypeError("Ledger entries are immutable; post a correcting entry instead.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise TypeError("Ledger entries are immutable; post a correcting entry instead.")
+
+    class Meta:
+        verbose_name = "Ledger Entry"
+        verbose_name_plural = "Ledger Entries"
+        ordering = ['account_holder', 'sequence']
+        constraints = [
+            models.UniqueConstraint(fields=['account_holder', 'sequence'], name='ledger_holder_sequence_uniq'),
+            models.CheckConstraint(condition=models.Q(amount__gt=0), name='ledger_amount_positive'),
+            models.UniqueConstraint(fields=['account_holder', 'idempotency_key'], name='ledger_idempotency_key_uniq',
+                                    condition=models.Q(idempotency_key__isnull=False)),
+        ]
+        indexes = [
+            # Point-in-time balances scan entries between a snapshot and the date.
+            models.Index(fields=['account_holder', 'created_at'], name='ledger_holder_created_idx'),
+        ]
+
+
+class AccountBalance(models.Model):
+    """
+    A holder's current balance, kept in step with the ledger. Posting moves
+    it with one guarded UPDATE, whose row lock serializes posting for the
+    holder until the transaction commits.
+    """
+    account_holder = models.PositiveIntegerField(primary_key=True)
+    balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    entry_count = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.account_holder} - {self.balance}"
+
+    class Meta:
+        verbose_name = "Account Balance"
+        verbose_name_plural = "Account Balances"
+
+
+class BalanceSnapshot(models.Model):
+    """
+    The balance after entry `sequence`, whose created_at is `as_of`. Written
+    every SAVINGS_SNAPSHOT_INTERVAL entries so a point-in-time balance never
+    sums more than that many entries.
+    """
+    account_holder = models.PositiveIntegerField()
+    sequence = models.PositiveBigIntegerField()
+    balance = models.DecimalField(max_digits=14, decimal_places=2)
+    as_of = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.account_holder} @{self.sequence} - {self.balance}"
+
+    class Meta:
+        verbose_name = "Balance Snapshot"
+        verbose_name_plural = "Balance Snapshots"
+        constraints = [
+            models.UniqueConstraint(fields=['account_holder', 'sequence'], name='snapshot_holder_sequence_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['account_holder', '-as_of'], name='snapshot_holder_as_of_idx'),
+        ]
+
+
+class SavingsRollup(models.Model):
+    """
+    Ledger totals for one holder over one day, ISO week (starting Monday) or
+    calendar month, in TIME_ZONE. Maintained by savings.rollups as entries
+    are posted; buckets without entries have no row.
+    """
+    DAY = 'day'
+    WEEK = 'week'
+    MONTH = 'month'
+    PERIOD_CHOICES = [
+        (DAY, 'Day'),
+        (WEEK, 'Week'),
+        (MONTH, 'Month'),
+    ]
+
+    account_holder = models.PositiveIntegerField()
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    bucket_start = models.DateField()
+    deposits = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    withdrawals = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    entry_count = models.PositiveIntegerField(default=0)
+    # Balance after the bucket's last entry.
+    closing_balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.account_holder} {self.period} {self.bucket_start}"
+
+    class Meta:
+        verbose_name = "Savings Rollup"
+        verbose_name_plural = "Savings Rollups"
+        constraints = [
+            # Also the index the aggregate endpoint reads buckets through.
+            models.UniqueConstraint(fields=['account_holder', 'period', 'bucket_start'], name='rollup_bucket_uniq'),
+        ]
@@ -0,0 +1,76 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class SavingsKeysetPagination(BasePagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    The `next` cursor is an opaque token for the last row returned; the
+    following page starts strictly after it. Together with the
+    (account_holder, -created_at, -id) index every page is the same short
+    index range scan, however deep the client pages.
+    """
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = 'limit'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        cursor = request.query_params.get('cursor')
+
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            # The redundant created_at bound lets the index range scan start at the cursor.
+            queryset = queryset.filter(
+                Q(created_at__lte=created_at),
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+
+        rows = list(queryset.order_by('-created_at', '-id')[:self.page_size + 1])
+        self.has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_cursor(self):
+        if self.has_more:
+            last = self.page[-1]
+            return self.encode_cursor(last.created_at, last.id)
+        return None
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_cursor(),
+            'results': data,
+        })
+
+    @staticmethod
+    def encode_cursor(created_at, pk):
+        raw = json.dumps({'c': created_at.isoformat(), 'i': pk})
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            created_at = parse_datetime(position['c'])
+            pk = int(position['i'])
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        if created_at is None:
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        return created_at, pk
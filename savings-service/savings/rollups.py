@@ -0,0 +1,91 @@
+"""
+Day, week and month totals per holder, kept current as entries are posted.
+
+post_entry calls record_entry inside its transaction, after the guarded
+balance UPDATE has locked the holder's AccountBalance row. Postings for a
+holder are therefore serialized, and the update-or-create per bucket below
+cannot race. rebuild_holder takes the same lock, so a backfill and live
+postings for one holder never interleave.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AccountBalance, LedgerEntry, SavingsRollup
+
+ZERO = Decimal('0.00')
+
+
+def bucket_starts(moment):
+    """
+    Returns {period: first day of the bucket containing moment}.
+    """
+    day = timezone.localtime(moment).date()
+    return {
+        SavingsRollup.DAY: day,
+        SavingsRollup.WEEK: day - timedelta(days=day.weekday()),
+        SavingsRollup.MONTH: day.replace(day=1),
+    }
+
+
+def record_entry(entry, balance):
+    """
+    Adds a just-posted entry to its three buckets; `balance` is the balance
+    after it. One UPDATE per bucket, plus an INSERT for a bucket's first entry.
+    """
+    deposit = entry.amount if entry.kind == LedgerEntry.DEPOSIT else ZERO
+    withdrawal = entry.amount - deposit
+
+    for period, bucket_start in bucket_starts(entry.created_at).items():
+        updated = SavingsRollup.objects.filter(
+            account_holder=entry.account_holder, period=period, bucket_start=bucket_start,
+        ).update(
+            deposits=F('deposits') + deposit,
+            withdrawals=F('withdrawals') + withdrawal,
+            entry_count=F('entry_count') + 1,
+            closing_balance=balance,
+        )
+        if not updated:
+            SavingsRollup.objects.create(
+                account_holder=entry.account_holder, period=period, bucket_start=bucket_start,
+                deposits=deposit, withdrawals=withdrawal, entry_count=1, closing_balance=balance,
+            )
+
+
+def rebuild_holder(account_holder, chunk_size=2000):
+    """
+    Recomputes all of a holder's buckets from their ledger and returns the
+    number written. Call inside a transaction; the holder's balance row stays
+    locked until it commits.
+    """
+    list(AccountBalance.objects.select_for_update().filter(account_holder=account_holder))
+    SavingsRollup.objects.filter(account_holder=account_holder).delete()
+
+    buckets = {}
+    balance = ZERO
+    entries = (
+        LedgerEntry.objects
+        .filter(account_holder=account_holder)
+        .order_by('sequence')
+        .values_list('kind', 'amount', 'created_at')
+        .iterator(chunk_size=chunk_size)
+    )
+    for kind, amount, created_at in entries:
+        deposit = amount if kind == LedgerEntry.DEPOSIT else ZERO
+        balance += deposit - (amount - deposit)
+        for key in bucket_starts(created_at).items():
+            rollup = buckets.get(key)
+            if rollup is None:
+                rollup = buckets[key] = SavingsRollup(
+                    account_holder=account_holder, period=key[0], bucket_start=key[1],
+                    deposits=ZERO, withdrawals=ZERO, entry_count=0,
+                )
+            rollup.deposits += deposit
+            rollup.withdrawals += amount - deposit
+            rollup.entry_count += 1
+            rollup.closing_balance = balance
+
+    SavingsRollup.objects.bulk_create(buckets.values(), batch_size=chunk_size)
+    return len(buckets)
@@ -1,5 +1,7 @@
+from decimal import Decimal
+
 from rest_framework import serializers
-from .models import SavingsAccount
+from .models import LedgerEntry, SavingsAccount, SavingsRollup
 
 class SavingsAccountSerializer(serializers.ModelSerializer):
     class Meta:
@@ -11,5 +13,34 @@ class SavingsAccountSerializer(serializers.ModelSerializer):
         if value < 0:
             raise serializers.ValidationError("Balance cannot be negative.")
         return value
-    
-    
+
+
+class LedgerEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LedgerEntry
+        fields = ['id', 'account_holder', 'sequence', 'kind', 'amount', 'description', 'created_at']
+        read_only_fields = ['id', 'account_holder', 'sequence', 'created_at']
+
+    def validate_amount(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Amount must be positive.")
+        return value
+
+
+class LedgerPostingSerializer(serializers.Serializer):
+    """
+    Body of the deposit and withdraw endpoints, where the URL gives the kind.
+    """
+    amount = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal('0.01'))
+    description = serializers.CharField(max_length=255, required=False, allow_blank=True)
+
+
+class SavingsRollupSerializer(serializers.ModelSerializer):
+    net = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SavingsRollup
+        fields = ['bucket_start', 'deposits', 'withdrawals', 'net', 'entry_count', 'closing_balance']
+
+    def get_net(self, rollup):
+        return str(rollup.deposits - rollup.withdrawals)
@@ -1,3 +1,298 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .authentication import UserDict
+from .ledger import InsufficientFunds, balance_at, post_entry
+from .models import AccountBalance, BalanceSnapshot, LedgerEntry, SavingsAccount, SavingsRollup
+
+
+class SavingsPaginationTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(user=UserDict({'user_id': 1, 'role': 'user'}))
+
+    def create_accounts(self, count, holder=1):
+        SavingsAccount.objects.bulk_create(
+            SavingsAccount(account_holder=holder, balance=Decimal(n)) for n in range(count)
+        )
+        return SavingsAccount.objects.filter(account_holder=holder)
+
+    def walk(self, url, params):
+        ids, cursor = [], None
+        while True:
+            response = self.client.get(url, {**params, **({'cursor': cursor} if cursor else {})})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [row['id'] for row in response.data['results']]
+            cursor = response.data['next']
+            if not cursor:
+                return ids
+
+    def test_list_pages_cover_every_row_once_newest_first(self):
+        accounts = self.create_accounts(12)
+        # Equal timestamps: the id tiebreaker must keep pages from overlapping.
+        accounts.update(created_at=timezone.now())
+        self.create_accounts(3, holder=2)
+
+        ids = self.walk(reverse('savings-list'), {'limit': 5})
+
+        self.assertEqual(ids, sorted(accounts.values_list('id', flat=True), reverse=True))
+
+    def test_search_is_paginated_within_the_date_range(self):
+        accounts = self.create_accounts(10)
+        now = timezone.now()
+        for n, account in enumerate(accounts.order_by('id')):
+            SavingsAccount.objects.filter(pk=account.pk).update(created_at=now - timedelta(days=n))
+
+        ids = self.walk(reverse('savings-search'), {
+            'from_date': (now - timedelta(days=5, hours=1)).isoformat(),
+            'end_date': (now - timedelta(days=1, hours=-1)).isoformat(),
+            'limit': 2,
+        })
+
+        expected = accounts.filter(created_at__gte=now - timedelta(days=5, hours=1),
+                                   created_at__lte=now - timedelta(days=1, hours=-1))
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(ids, list(expected.order_by('-created_at', '-id').values_list('id', flat=True)))
+
+    def test_invalid_cursor_is_rejected(self):
+        self.create_accounts(1)
+
+        response = self.client.get(reverse('savings-list'), {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SavingsExportTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(user=UserDict({'user_id': 1, 'role': 'user'}))
+        SavingsAccount.objects.bulk_create(
+            SavingsAccount(account_holder=holder, balance=Decimal('10.50') * n)
+            for holder in (1, 2) for n in range(1, 4)
+        )
+
+    def export(self, **params):
+        response = self.client.get(reverse('savings-export'), params, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export_streams_only_the_callers_rows(self):
+        lines = [json.loads(line) for line in self.export().splitlines()]
+
+        expected = SavingsAccount.objects.filter(account_holder=1).order_by('-created_at', '-id')
+        self.assertEqual([line['id'] for line in lines], [account.id for account in expected])
+        self.assertEqual(lines[0]['balance'], str(expected[0].balance))
+        self.assertEqual(lines[0]['created_at'], expected[0].created_at.isoformat())
+
+    def test_csv_export_has_a_header_row(self):
+        with self.settings(SAVINGS_EXPORT_CHUNK_SIZE=2):
+            rows = list(csv.reader(io.StringIO(self.export(type='csv'))))
+
+        self.assertEqual(rows[0], ['id', 'account_holder', 'balance', 'created_at'])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual({row[1] for row in rows[1:]}, {'1'})
+
+    def test_unknown_type_is_rejected(self):
+        response = self.client.get(reverse('savings-export'), {'type': 'xlsx'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(SAVINGS_SNAPSHOT_INTERVAL=3)
+class LedgerTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(user=UserDict({'user_id': 1, 'role': 'user'}))
+        self.start = timezone.now() - timedelta(days=1)
+        self.clock = (self.start + timedelta(minutes=n) for n in range(1000))
+
+    def post(self, kind, amount, holder=1):
+        with mock.patch('savings.ledger.timezone.now', side_effect=lambda: next(self.clock)):
+            return post_entry(holder, kind, Decimal(amount))
+
+    def test_posting_updates_the_balance_and_numbers_entries(self):
+        response = self.client.post(reverse('ledger-entry-create'), {'kind': 'deposit', 'amount': '25.00'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['balance'], '25.00')
+
+        response = self.client.post(reverse('ledger-entry-create'), {'kind': 'withdrawal', 'amount': '10.50'})
+        self.assertEqual(response.data['sequence'], 2)
+        self.assertEqual(response.data['balance'], '14.50')
+
+        response = self.client.get(reverse('ledger-balance'))
+        self.assertEqual(response.data['balance'], '14.50')
+
+    def test_overdraft_is_rejected_without_an_entry(self):
+        self.post('deposit', '5')
+
+        response = self.client.post(reverse('ledger-entry-create'), {'kind': 'withdrawal', 'amount': '6'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(LedgerEntry.objects.count(), 1)
+        self.assertEqual(AccountBalance.objects.get(account_holder=1).balance, Decimal('5'))
+        with self.assertRaises(InsufficientFunds):
+            post_entry(1, 'withdrawal', Decimal('6'))
+
+    def test_balance_at_matches_the_running_total(self):
+        running, expected = Decimal('0'), []
+        for n in range(1, 11):
+            kind, amount = ('withdrawal', n) if n % 4 == 0 else ('deposit', 10 * n)
+            entry, _, _ = self.post(kind, amount)
+            running += entry.signed_amount
+            expected.append((entry.created_at, running))
+        self.post('deposit', 999, holder=2)
+
+        self.assertEqual(BalanceSnapshot.objects.filter(account_holder=1).count(), 3)
+        self.assertEqual(balance_at(1, self.start - timedelta(seconds=1)), 0)
+        for created_at, total in expected:
+            self.assertEqual(balance_at(1, created_at), total)
+            self.assertEqual(balance_at(1, created_at + timedelta(seconds=30)), total)
+
+        response = self.client.get(reverse('ledger-balance'), {'at': expected[4][0].isoformat()})
+        self.assertEqual(Decimal(response.data['balance']), expected[4][1])
+
+    def test_entries_are_immutable(self):
+        entry, _, _ = self.post('deposit', 5)
+
+        entry.amount = Decimal('500')
+        with self.assertRaises(TypeError):
+            entry.save()
+        with self.assertRaises(TypeError):
+            LedgerEntry.objects.filter(pk=entry.pk).update(amount=Decimal('500'))
+        with self.assertRaises(TypeError):
+            LedgerEntry.objects.all().delete()
+
+
+class DepositWithdrawTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(user=UserDict({'user_id': 1, 'role': 'user'}))
+
+    def deposit(self, amount, key=None):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        return self.client.post(reverse('ledger-deposit'), {'amount': amount}, **headers)
+
+    def withdraw(self, amount, key=None):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        return self.client.post(reverse('ledger-withdraw'), {'amount': amount}, **headers)
+
+    def test_deposit_and_withdraw_move_the_balance(self):
+        self.assertEqual(self.deposit('30.00').data['balance'], '30.00')
+
+        response = self.withdraw('12.25')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['kind'], 'withdrawal')
+        self.assertEqual(response.data['balance'], '17.75')
+
+    def test_withdrawal_cannot_overdraw(self):
+        self.assertEqual(self.withdraw('1.00').status_code, status.HTTP_400_BAD_REQUEST)
+        self.deposit('5.00')
+
+        response = self.withdraw('5.01')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(AccountBalance.objects.get(account_holder=1).balance, Decimal('5.00'))
+        self.assertEqual(LedgerEntry.objects.count(), 1)
+
+    def test_retry_with_the_same_key_is_applied_once(self):
+        first = self.deposit('10.00', key='abc')
+        self.deposit('1.00')
+
+        retry = self.deposit('10.00', key='abc')
+
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data['id'], first.data['id'])
+        self.assertEqual(AccountBalance.objects.get(account_holder=1).balance, Decimal('11.00'))
+
+    def test_racing_retry_rolls_back_its_balance_change(self):
+        first = self.deposit('10.00', key='abc')
+
+        # The retry misses the replay lookup, as if it raced the original.
+        with mock.patch('savings.ledger._replay', side_effect=[None, LedgerEntry.objects.get()]):
+            retry = self.deposit('10.00', key='abc')
+
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.data['id'], first.data['id'])
+        self.assertEqual(AccountBalance.objects.get(account_holder=1).balance, Decimal('10.00'))
+
+    def test_key_reused_for_a_different_amount_is_rejected(self):
+        self.deposit('10.00', key='abc')
+
+        response = self.deposit('20.00', key='abc')
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_keys_are_scoped_to_the_holder(self):
+        self.deposit('10.00', key='abc')
+        self.client.force_authenticate(user=UserDict({'user_id': 2, 'role': 'user'}))
+
+        self.assertEqual(self.deposit('10.00', key='abc').status_code, status.HTTP_201_CREATED)
+
+
+class SavingsRollupTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(user=UserDict({'user_id': 1, 'role': 'user'}))
+
+    def post(self, kind, amount, when, holder=1):
+        with mock.patch('savings.ledger.timezone.now', return_value=when):
+            return post_entry(holder, kind, Decimal(amount))
+
+    def seed(self):
+        # Sat 31 May, Sun 1 Jun and Mon 2 Jun 2025 (UTC).
+        self.post('deposit', '100.00', datetime(2025, 5, 31, 9, tzinfo=dt_timezone.utc))
+        self.post('withdrawal', '30.00', datetime(2025, 6, 1, 9, tzinfo=dt_timezone.utc))
+        self.post('deposit', '5.50', datetime(2025, 6, 1, 18, tzinfo=dt_timezone.utc))
+        self.post('deposit', '20.00', datetime(2025, 6, 2, 9, tzinfo=dt_timezone.utc))
+        self.post('deposit', '999.00', datetime(2025, 6, 2, 9, tzinfo=dt_timezone.utc), holder=2)
+
+    def buckets(self, period, **params):
+        response = self.client.get(reverse('ledger-rollups'), {'period': period, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(row['bucket_start'], row['deposits'], row['withdrawals'], row['net'],
+                 row['entry_count'], row['closing_balance']) for row in response.data['results']]
+
+    def test_postings_update_day_week_and_month_buckets(self):
+        self.seed()
+
+        self.assertEqual(self.buckets('day'), [
+            ('2025-05-31', '100.00', '0.00', '100.00', 1, '100.00'),
+            ('2025-06-01', '5.50', '30.00', '-24.50', 2, '75.50'),
+            ('2025-06-02', '20.00', '0.00', '20.00', 1, '95.50'),
+        ])
+        self.assertEqual(self.buckets('week'), [
+            ('2025-05-26', '105.50', '30.00', '75.50', 3, '75.50'),
+            ('2025-06-02', '20.00', '0.00', '20.00', 1, '95.50'),
+        ])
+        self.assertEqual(self.buckets('month', from_date='2025-06-01'), [
+            ('2025-06-01', '25.50', '30.00', '-4.50', 3, '95.50'),
+        ])
+
+    def test_backfill_rebuilds_the_same_buckets(self):
+        self.seed()
+        expected = {period: self.buckets(period) for period in ('day', 'week', 'month')}
+        SavingsRollup.objects.all().delete()
+
+        call_command('backfill_rollups', chunk_size=1, stdout=io.StringIO())
+
+        self.assertEqual({period: self.buckets(period) for period in ('day', 'week', 'month')}, expected)
+        self.assertEqual(SavingsRollup.objects.filter(account_holder=2).count(), 3)
+
+    def test_unknown_period_is_rejected(self):
+        response = self.client.get(reverse('ledger-rollups'), {'period': 'year'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
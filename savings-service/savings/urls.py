@@ -1,8 +1,17 @@
 from django.urls import path
-from .views import SavingsAccountCreateView, SavingsAccountsListView, SavingsAccountSearchAPI
+from .views import (
+    SavingsAccountCreateView, SavingsAccountsListView, SavingsAccountSearchAPI, SavingsAccountExportView,
+    LedgerEntryCreateView, DepositView, WithdrawView, AccountBalanceView, SavingsRollupView,
+)
 
 urlpatterns = [
     path('savings/create/', SavingsAccountCreateView.as_view(), name='savings-create'),
     path('savings/', SavingsAccountsListView.as_view(), name='savings-list'),
     path('savings/search/', SavingsAccountSearchAPI.as_view(), name='savings-search'),
+    path('savings/export/', SavingsAccountExportView.as_view(), name='savings-export'),
+    path('savings/ledger/entries/', LedgerEntryCreateView.as_view(), name='ledger-entry-create'),
+    path('savings/ledger/deposit/', DepositView.as_view(), name='ledger-deposit'),
+    path('savings/ledger/withdraw/', WithdrawView.as_view(), name='ledger-withdraw'),
+    path('savings/ledger/balance/', AccountBalanceView.as_view(), name='ledger-balance'),
+    path('savings/ledger/rollups/', SavingsRollupView.as_view(), name='ledger-rollups'),
 ]
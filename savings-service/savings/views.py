@@ -1,11 +1,21 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
-from .models import SavingsAccount
-from .serializers import SavingsAccountSerializer
+from .export import EXPORTERS
+from .ledger import IdempotencyKeyReused, LedgerError, balance_at, current_balance, post_entry
+from .models import LedgerEntry, SavingsAccount, SavingsRollup
+from .pagination import SavingsKeysetPagination
+from .serializers import (
+    LedgerEntrySerializer, LedgerPostingSerializer, SavingsAccountSerializer, SavingsRollupSerializer,
+)
 from .authentication import JWTAuthentication
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.renderers import JSONRenderer
 from rest_framework.views import APIView
-from django.utils.dateparse import parse_datetime
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 # Create your views here.
 class SavingsAccountCreateView(generics.CreateAPIView):
@@ -22,6 +32,7 @@ class SavingsAccountsListView(generics.ListAPIView):
     serializer_class = SavingsAccountSerializer
     permission_classes = [IsAuthenticated]
     authentication_classes = [JWTAuthentication]
+    pagination_class = SavingsKeysetPagination
 
 
     def get_queryset(self):
@@ -30,6 +41,7 @@ class SavingsAccountsListView(generics.ListAPIView):
 class SavingsAccountSearchAPI(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = SavingsKeysetPagination
 
     def get(self, request):
         from_date = request.query_params.get("from_date")
@@ -58,5 +70,180 @@ class SavingsAccountSearchAPI(APIView):
         else:
             queryset = queryset.filter(created_at__gte=from_date)
 
-        serializer = SavingsAccountSerializer(queryset, many=True)
-        return Response(serializer.data, status=200)
\ No newline at end of file
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = SavingsAccountSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+
+class FirstRendererNegotiation(BaseContentNegotiation):
+    """
+    Ignores Accept: the export picks its own content type, and error
+    responses are always JSON.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class SavingsAccountExportView(APIView):
+    """
+    Streams the caller's whole savings history, newest first, as NDJSON
+    (default) or CSV: ?type=ndjson|csv, optionally narrowed with from_date
+    and end_date. `type` rather than `format`, which DRF reserves for
+    renderer selection.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer]
+    content_negotiation_class = FirstRendererNegotiation
+
+    def get(self, request):
+        export_type = request.query_params.get("type", "ndjson")
+        if export_type not in EXPORTERS:
+            return Response({"error": f"type must be one of {', '.join(EXPORTERS)}"}, status=400)
+
+        queryset = SavingsAccount.objects.filter(account_holder=request.user["user_id"])
+        for param, lookup in (("from_date", "created_at__gte"), ("end_date", "created_at__lte")):
+            value = request.query_params.get(param)
+            if value:
+                parsed = parse_datetime(value.strip())
+                if not parsed:
+                    return Response({"error": f"Invalid {param} format. Use ISO8601 (e.g., 2025-08-21T15:39:30Z)."}, status=400)
+                queryset = queryset.filter(**{lookup: parsed})
+
+        rows, content_type = EXPORTERS[export_type]
+        response = StreamingHttpResponse(
+            rows(queryset.order_by('-created_at', '-id'), settings.SAVINGS_EXPORT_CHUNK_SIZE),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="savings.{export_type}"'
+        return response
+
+
+
+class LedgerEntryCreateView(APIView):
+    """
+    Posts a deposit or withdrawal to the caller's ledger and returns the
+    entry with the resulting balance.
+
+    Clients should send an Idempotency-Key header (up to 64 characters) and
+    reuse it when retrying: a post already applied under that key is answered
+    200 with the original entry and Idempotent-Replayed: true instead of
+    being applied twice. Reusing a key for a different kind or amount is 422.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = LedgerEntrySerializer
+    kind = None
+
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        fields = dict(serializer.validated_data)
+        if self.kind:
+            fields['kind'] = self.kind
+
+        idempotency_key = request.headers.get("Idempotency-Key", "").strip() or None
+        if idempotency_key and len(idempotency_key) > 64:
+            return Response({"error": "Idempotency-Key must be at most 64 characters"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            entry, balance, replayed = post_entry(request.user["user_id"], idempotency_key=idempotency_key, **fields)
+        except IdempotencyKeyReused as e:
+            return Response({"error": e.message}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        except LedgerError as e:
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = Response(
+            {**LedgerEntrySerializer(entry).data, "balance": str(balance)},
+            status=status.HTTP_200_OK if replayed else status.HTTP_201_CREATED,
+        )
+        if replayed:
+            response["Idempotent-Replayed"] = "true"
+        return response
+
+
+class DepositView(LedgerEntryCreateView):
+    """
+    Adds {"amount", "description"} to the caller's balance.
+    """
+    serializer_class = LedgerPostingSerializer
+    kind = LedgerEntry.DEPOSIT
+
+
+class WithdrawView(LedgerEntryCreateView):
+    """
+    Takes {"amount", "description"} from the caller's balance; 400 if that
+    would leave it negative.
+    """
+    serializer_class = LedgerPostingSerializer
+    kind = LedgerEntry.WITHDRAWAL
+
+
+class AccountBalanceView(APIView):
+    """
+    The caller's current ledger balance, or with ?at=<ISO8601> the balance
+    after every entry posted up to that moment.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        account_holder = request.user["user_id"]
+        at = request.query_params.get("at")
+
+        if at:
+            at = parse_datetime(at.strip())
+            if not at:
+                return Response({"error": "Invalid at format. Use ISO8601 (e.g., 2025-08-21T15:39:30Z)."}, status=400)
+            if timezone.is_naive(at):
+                at = timezone.make_aware(at)
+            balance = balance_at(account_holder, at)
+        else:
+            balance = current_balance(account_holder)
+
+        return Response({
+            "account_holder": account_holder,
+            "balance": str(balance),
+            "at": at.isoformat() if at else None,
+        })
+
+
+
+class SavingsRollupView(APIView):
+    """
+    The caller's ledger totals per day, week or month (?period=, default
+    day), oldest first, read straight from the rollup table. from_date and
+    end_date (YYYY-MM-DD) select buckets by their first day; without them the
+    latest SAVINGS_ROLLUP_MAX_BUCKETS buckets are returned. Periods with no
+    entries are omitted; their closing balance is the previous bucket's.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        period = request.query_params.get("period", SavingsRollup.DAY)
+        periods = [choice for choice, _ in SavingsRollup.PERIOD_CHOICES]
+        if period not in periods:
+            return Response({"error": f"period must be one of {', '.join(periods)}"}, status=400)
+
+        queryset = SavingsRollup.objects.filter(account_holder=request.user["user_id"], period=period)
+        for param, lookup in (("from_date", "bucket_start__gte"), ("end_date", "bucket_start__lte")):
+            value = request.query_params.get(param)
+            if value:
+                parsed = parse_date(value.strip())
+                if not parsed:
+                    return Response({"error": f"Invalid {param} format. Use YYYY-MM-DD."}, status=400)
+                queryset = queryset.filter(**{lookup: parsed})
+
+        rollups = list(queryset.order_by('-bucket_start')[:settings.SAVINGS_ROLLUP_MAX_BUCKETS])
+        rollups.reverse()
+        return Response({
+            "period": period,
+            "results": SavingsRollupSerializer(rollups, many=True).data,
+        })
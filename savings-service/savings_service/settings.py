@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 load_dotenv()
 
 DJANGO_SECRET_KEY = os.getenv('DJANGO_SECRET_KEY')
@@ -24,6 +25,11 @@ DB_HOST = os.getenv('DB_HOST')
 DB_PORT = os.getenv('DB_PORT')
 
 
+KAFKA_BOOTSTRAP_SERVERS = os.getenv('KAFKA_BOOTSTRAP_SERVERS', 'kafka:9092')
+USER_EVENTS_TOPIC = os.getenv('USER_EVENTS_TOPIC', 'user-events')
+# Each service needs its own consumer group so every replica sees every event.
+USER_REPLICA_CONSUMER_GROUP = os.getenv('USER_REPLICA_CONSUMER_GROUP', 'savings-service-user-replica')
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,6 +48,11 @@ ALLOWED_HOSTS = []
 
 # Application definition
 
+# SERVICE_PROFILE: 'api' or 'full' (see docker-compose.yml)
+SERVICE_PROFILE = os.getenv('SERVICE_PROFILE', 'full')
+if SERVICE_PROFILE not in ('api', 'full'):
+    raise ImproperlyConfigured(f"SERVICE_PROFILE must be 'api' or 'full', not {SERVICE_PROFILE!r}")
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -52,6 +63,8 @@ INSTALLED_APPS = [
     'rest_framework',
 
     'savings',
+    # Local copy of user profiles, fed by user-service events (shared/user_replica).
+    'user_replica',
 
 ]
 
@@ -65,6 +78,17 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if SERVICE_PROFILE == 'api':
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS
+        if app not in ('django.contrib.admin', 'django.contrib.sessions',
+                       'django.contrib.messages', 'django.contrib.staticfiles')
+    ]
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.common.CommonMiddleware',
+    ]
+
 ROOT_URLCONF = 'savings_service.urls'
 
 TEMPLATES = [
@@ -110,6 +134,19 @@ REST_FRAMEWORK = {
     ],
 }
 
+if SERVICE_PROFILE == 'api':
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ['rest_framework.renderers.JSONRenderer']
+
+
+# Rows fetched per round trip by the savings export (savings/export/).
+SAVINGS_EXPORT_CHUNK_SIZE = int(os.getenv('SAVINGS_EXPORT_CHUNK_SIZE', 2000))
+
+# A BalanceSnapshot is written every SAVINGS_SNAPSHOT_INTERVAL ledger entries per
+# holder, which bounds the entries summed for a point-in-time balance.
+SAVINGS_SNAPSHOT_INTERVAL = int(os.getenv('SAVINGS_SNAPSHOT_INTERVAL', 100))
+
+# Most buckets returned by the rollup endpoint (savings/ledger/rollups/).
+SAVINGS_ROLLUP_MAX_BUCKETS = int(os.getenv('SAVINGS_ROLLUP_MAX_BUCKETS', 400))
 
 
 # Password validation
@@ -0,0 +1,102 @@
+"""
+Startup time and per-request overhead of a service under each SERVICE_PROFILE.
+
+    python scripts/bench_profiles.py group-service [--path /api/groups/] [--requests N] [--runs N]
+
+Each run starts a fresh interpreter, so startup covers importing Django,
+settings, apps, the URLconf and building the WSGI handler (middleware chain).
+Requests go through that handler without a token, which exercises the
+middleware, routing and DRF authentication but never touches the database.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# An endpoint of each service that answers an anonymous request without
+# touching the database.
+DEFAULT_PATHS = {
+    'user-service': '/accounts/v1/.well-known/jwks.json',
+    'group-service': '/api/groups/members/bulk/',
+    'goal-service': '/api/goals/create/',
+    'savings-service': '/api/savings/',
+}
+
+CHILD = '''
+import json, sys, time
+started = time.perf_counter()
+import django
+from django.core.wsgi import get_wsgi_application
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+get_wsgi_application()
+startup = time.perf_counter() - started
+
+from django.test import Client
+from django.test.utils import setup_test_environment
+setup_test_environment()
+client = Client(HTTP_ACCEPT='application/json')
+path, count = sys.argv[1], int(sys.argv[2])
+status = client.get(path).status_code
+for _ in range(min(count, 200)):
+    client.get(path)
+started = time.perf_counter()
+for _ in range(count):
+    client.get(path)
+per_request = (time.perf_counter() - started) / count
+print(json.dumps({'startup': startup, 'per_request': per_request, 'status': status}))
+'''
+
+
+def run(service, profile, path, requests, settings_module):
+    env = {
+        **os.environ,
+        'SERVICE_PROFILE': profile,
+        'DJANGO_SETTINGS_MODULE': settings_module,
+    }
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD, path, str(requests)],
+        cwd=os.path.join(ROOT, service), env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        sys.exit(f"{service} ({profile}) failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('service', choices=sorted(DEFAULT_PATHS))
+    parser.add_argument('--path', help="Request path (defaults to an unauthenticated API endpoint).")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--settings', help="Settings module (defaults to <service>_service.settings).")
+    args = parser.parse_args()
+
+    path = args.path or DEFAULT_PATHS[args.service]
+    settings_module = args.settings or f"{args.service.replace('-', '_')}.settings"
+
+    results = {}
+    for profile in ('full', 'api'):
+        runs = [run(args.service, profile, path, args.requests, settings_module) for _ in range(args.runs)]
+        results[profile] = {
+            'startup': statistics.median(r['startup'] for r in runs),
+            'per_request': statistics.median(r['per_request'] for r in runs),
+            'status': runs[0]['status'],
+        }
+
+    print(f"{args.service} GET {path} (median of {args.runs} runs, {args.requests} requests each)")
+    for profile, r in results.items():
+        print(f"  {profile:>4}: startup {r['startup'] * 1000:7.1f} ms, "
+              f"{r['per_request'] * 1e6:7.1f} us/request (HTTP {r['status']})")
+    full, api = results['full'], results['api']
+    print(f"  api saves {(full['startup'] - api['startup']) * 1000:.1f} ms at startup and "
+          f"{(full['per_request'] - api['per_request']) * 1e6:.1f} us per request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Mint and verify cost of each access token algorithm user-service can issue.
+
+    python benchmarks/bench_algorithms.py [--iterations N]
+
+Minting is what every login and refresh pays in user-service; verifying is
+what every authenticated request pays in the other services (when the
+verified-token cache misses). Keys are parsed once, as in production.
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jwt_auth.keys import algorithm_for_key  # noqa: E402
+from jwt_auth.verifier import StaticKey, TokenVerifier  # noqa: E402
+
+KEYS = {
+    'RSA-2048': lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    'RSA-3072': lambda: rsa.generate_private_key(public_exponent=65537, key_size=3072),
+    'EC P-256': lambda: ec.generate_private_key(ec.SECP256R1()),
+    'Ed25519': ed25519.Ed25519PrivateKey.generate,
+}
+
+
+def per_second(func, iterations):
+    return iterations / timeit.timeit(func, number=iterations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    claims = {'user_id': 1, 'role': 'user', 'exp': int(time.time()) + 300}
+    print(f"{'key':>9} {'alg':>6} {'mint/s':>9} {'verify/s':>9} {'token bytes':>12}")
+    for name, generate in KEYS.items():
+        private_key = generate()
+        algorithm = algorithm_for_key(private_key.public_key())
+        verifier = TokenVerifier(StaticKey(private_key.public_key()))
+
+        token = jwt.encode(claims, private_key, algorithm=algorithm, headers={'kid': 'bench'})
+        mint = per_second(lambda: jwt.encode(claims, private_key, algorithm=algorithm, headers={'kid': 'bench'}), args.iterations)
+        verify = per_second(lambda: verifier.verify(token), args.iterations)
+        print(f"{name:>9} {algorithm:>6} {mint:9.0f} {verify:9.0f} {len(token):12d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Per-request token verification cost, before and after jwt_auth.
+
+    python benchmarks/bench_verify.py [--iterations N] [--distinct-tokens N]
+
+"pem string" reproduces the old per-service code, which handed the PEM text
+to jwt.decode so every request re-parsed the RSA key. "key object" parses
+the key once. "cached" adds the verified-token LRU, with requests spread
+over --distinct-tokens live tokens.
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jwt_auth.cache import VerifiedTokenCache  # noqa: E402
+from jwt_auth.keys import load_public_key  # noqa: E402
+from jwt_auth.verifier import StaticKey, TokenVerifier  # noqa: E402
+
+
+def make_tokens(private_key, count):
+    exp = int(time.time()) + 300
+    return [
+        jwt.encode({'user_id': i, 'role': 'user', 'exp': exp}, private_key, algorithm='RS256')
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--distinct-tokens', type=int, default=100)
+    args = parser.parse_args()
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode('ascii')
+    tokens = make_tokens(private_key, args.distinct_tokens)
+
+    key = StaticKey(load_public_key(public_pem))
+    uncached = TokenVerifier(key)
+    cached = TokenVerifier(key, cache=VerifiedTokenCache(maxsize=4096))
+
+    cases = {
+        'pem string': lambda token: jwt.decode(token, public_pem, algorithms=['RS256']),
+        'key object': uncached.verify,
+        'cached': cached.verify,
+    }
+
+    baseline = None
+    for name, verify in cases.items():
+        counter = iter(range(args.iterations))
+        seconds = timeit.timeit(lambda: verify(tokens[next(counter) % len(tokens)]), number=args.iterations)
+        per_call = seconds / args.iterations * 1e6
+        baseline = baseline or per_call
+        print(f"{name:>10}: {per_call:8.1f} us/request  {baseline / per_call:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
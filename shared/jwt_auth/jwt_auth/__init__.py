@@ -0,0 +1,6 @@
+"""
+Shared JWT authentication for the services that verify user-service tokens.
+
+DRF integration lives in jwt_auth.authentication, which reads PUBLIC_KEY on
+import. The key, cache and verifier modules have no Django dependency.
+"""
@@ -0,0 +1,100 @@
+from decouple import config
+from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from .cache import VerifiedTokenCache
+from .jwks import JWKSKeySet
+from .keys import load_public_key
+from .verifier import StaticKey, TokenVerifier
+
+
+class UserDict(dict):
+    """
+    A simple proxy class to make the JWT payload behave like a Django User object
+    for permission checks. `user_id` is coerced to int and also exposed as `.id`.
+    """
+    def __init__(self, payload):
+        super().__init__(payload)
+        self._id = None
+
+        for claim in ('user_id', 'id'):
+            if claim in self:
+                try:
+                    self[claim] = self._id = int(self[claim])
+                    break
+                except (ValueError, TypeError):
+                    pass
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+
+def build_key_source():
+    """
+    Keys come from user-service's JWKS endpoint when JWKS_URL is set, with
+    PUBLIC_KEY (if present) as the fallback for tokens without a `kid`.
+    Static keys are parsed once per process, not on every request.
+    """
+    public_key = config('PUBLIC_KEY', default='')
+    jwks_url = config('JWKS_URL', default='')
+
+    static = StaticKey(load_public_key(public_key)) if public_key else None
+    if jwks_url:
+        return JWKSKeySet(
+            jwks_url,
+            refresh_interval=config('JWKS_REFRESH_SECONDS', default=300, cast=int),
+            fallback=static,
+        )
+    if static is None:
+        raise RuntimeError('Set JWKS_URL or PUBLIC_KEY to verify access tokens.')
+    return static
+
+
+verifier = TokenVerifier(
+    build_key_source(),
+    cache=VerifiedTokenCache(maxsize=config('JWT_VERIFIED_CACHE_SIZE', default=4096, cast=int)),
+)
+
+
+def warm_keys():
+    """
+    Fetches the JWKS key set before the process serves requests. Called from
+    each service's wsgi.py/asgi.py; a no-op for a static PUBLIC_KEY.
+    """
+    if isinstance(verifier.keys, JWKSKeySet):
+        verifier.keys.start()
+
+
+class JWTAuthentication(BaseAuthentication):
+    def authenticate(self, request):
+        auth_header = request.headers.get('Authorization')
+
+        if not auth_header or not auth_header.startswith('Bearer '):
+            return None
+
+        token = auth_header.split(' ')[1]
+
+        try:
+            payload = verifier.verify(token)
+        except ExpiredSignatureError:
+            raise AuthenticationFailed('Token has expired')
+        except InvalidTokenError:
+            raise AuthenticationFailed('Invalid token')
+        except Exception as e:
+            # Print the error for debugging
+            print(f"Authentication failed during token decoding: {e}")
+            raise AuthenticationFailed(f'Authentication failed: {str(e)}')
+
+        # Copy, so per-request changes never leak into the cached payload.
+        user = UserDict(payload)
+        return (user, token)
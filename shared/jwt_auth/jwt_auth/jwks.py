@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+
+from jwt import PyJWKSet
+from jwt.exceptions import InvalidTokenError, PyJWKSetError
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSKeySet:
+    """
+    In-memory copy of user-service's JWKS document, kept fresh by a daemon thread.
+
+    Call start() once at process start (the services do it from wsgi.py and
+    asgi.py) to fetch the document before the first request arrives. Lookups
+    only ever read the local copy and never wait on the network; in a process
+    that was not warmed (or was forked after warming) the first lookup just
+    starts the refresher thread. An unknown
+    `kid` (typically a key that was just rotated in) wakes the refresher early,
+    rate-limited by min_refresh_interval. A failed fetch keeps the last good
+    key set (stale-while-revalidate), so a user-service outage does not stop
+    verification with keys we already know.
+
+    Tokens without a `kid`, or with a `kid` we do not know yet, fall back to
+    `fallback` (a StaticKey) when one is configured.
+    """
+
+    def __init__(self, url, refresh_interval=300, min_refresh_interval=10, timeout=5, fallback=None):
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.fallback = fallback
+        self._keys = {}
+        self._last_attempt = 0.0
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def resolve(self, kid):
+        self._ensure_started()
+        entry = self._keys.get(kid) if kid else None
+        if entry is not None:
+            return entry
+
+        if kid:
+            self.request_refresh()
+        if self.fallback is not None:
+            return self.fallback.resolve(kid)
+        raise InvalidTokenError(f"Unknown signing key {kid!r}")
+
+    def start(self):
+        """
+        Fetches the key set now and starts the refresher. Blocks for up to
+        `timeout` seconds, so call it while the process boots, never from a
+        request.
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.refresh()
+            self._start_refresher()
+
+    def request_refresh(self):
+        if time.monotonic() - self._last_attempt >= self.min_refresh_interval:
+            self._wake.set()
+
+    def refresh(self):
+        self._last_attempt = time.monotonic()
+        try:
+            with urllib.request.urlopen(self.url, timeout=self.timeout) as response:
+                document = json.load(response)
+            key_set = PyJWKSet.from_dict(document)
+        except (OSError, ValueError, PyJWKSetError) as e:
+            logger.warning("JWKS refresh from %s failed, keeping %d cached keys: %s", self.url, len(self._keys), e)
+            return False
+
+        # Each kid accepts only its own algorithm, so keys of different types
+        # can be published side by side during a migration.
+        # Swap the whole mapping at once; readers never see a half-built set.
+        self._keys = {
+            jwk.key_id: (jwk.key, [jwk.algorithm_name])
+            for jwk in key_set.keys
+            if jwk.key_id
+        }
+        return True
+
+    def _ensure_started(self):
+        # Threads do not survive fork(), so each worker process starts its own.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Never fetch here: this runs on the request path. With no keys
+            # yet, the refresher fetches as soon as it starts.
+            self._start_refresher()
+
+    def _start_refresher(self):
+        self._wake = threading.Event()
+        if not self._keys:
+            self._wake.set()
+        threading.Thread(target=self._run, name='jwks-refresh', daemon=True).start()
+        self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+            self.refresh()
@@ -0,0 +1,29 @@
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
+
+def load_public_key(content):
+    """
+    Parses a public key once into a key object that PyJWT can reuse.
+
+    Accepts a full PEM document or, as the services' PUBLIC_KEY env vars
+    hold, just the base64 body between the BEGIN/END lines.
+    """
+    content = content.strip()
+    if not content.startswith('-----BEGIN'):
+        content = f"-----BEGIN PUBLIC KEY-----\n{content}\n-----END PUBLIC KEY-----\n"
+    return load_pem_public_key(content.encode('utf-8'))
+
+
+def algorithm_for_key(key):
+    """
+    The JWS algorithm a key signs with, as issued by user-service:
+    RSA -> RS256, EC P-256 -> ES256, Ed25519 -> EdDSA.
+    """
+    if isinstance(key, rsa.RSAPublicKey):
+        return 'RS256'
+    if isinstance(key, ec.EllipticCurvePublicKey) and isinstance(key.curve, ec.SECP256R1):
+        return 'ES256'
+    if isinstance(key, ed25519.Ed25519PublicKey):
+        return 'EdDSA'
+    raise ValueError(f"Unsupported token key type {type(key).__name__}")
@@ -0,0 +1,46 @@
+import jwt
+
+from .keys import algorithm_for_key
+
+
+class StaticKey:
+    """
+    A single verification key, used regardless of the token's `kid`.
+    The accepted algorithm defaults to the one matching the key type.
+    """
+
+    def __init__(self, key, algorithms=None):
+        self.key = key
+        self.algorithms = list(algorithms or [algorithm_for_key(key)])
+
+    def resolve(self, kid):
+        return self.key, self.algorithms
+
+
+class TokenVerifier:
+    """
+    Verifies access tokens, consulting a VerifiedTokenCache first so a token
+    presented repeatedly within its lifetime is only checked cryptographically
+    once. `keys` maps the token's `kid` header to a key and its algorithms
+    (a StaticKey or a jwks.JWKSKeySet).
+
+    Raises PyJWT's exceptions for invalid or expired tokens.
+    """
+
+    def __init__(self, keys, cache=None):
+        self.keys = keys
+        self.cache = cache
+
+    def verify(self, token):
+        if self.cache is not None:
+            payload = self.cache.get(token)
+            if payload is not None:
+                return payload
+
+        kid = jwt.get_unverified_header(token).get('kid')
+        key, algorithms = self.keys.resolve(kid)
+        payload = jwt.decode(token, key, algorithms=algorithms)
+
+        if self.cache is not None:
+            self.cache.put(token, payload)
+        return payload
@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+import time
+from unittest import TestCase, mock
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from jwt_auth.cache import VerifiedTokenCache
+from jwt_auth.jwks import JWKSKeySet
+from jwt_auth.verifier import StaticKey, TokenVerifier
+
+
+class VerifiedTokenCacheTest(TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = VerifiedTokenCache(maxsize=2)
+        exp = time.time() + 60
+        cache.put('a', {'exp': exp})
+        cache.put('b', {'exp': exp})
+        cache.get('a')
+        cache.put('c', {'exp': exp})
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_entries_expire_with_the_token(self):
+        cache = VerifiedTokenCache()
+        cache.put('expired', {'exp': time.time() - 1})
+        cache.put('no-exp', {'user_id': 1})
+
+        self.assertIsNone(cache.get('expired'))
+        self.assertIsNone(cache.get('no-exp'))
+        self.assertEqual(len(cache), 0)
+
+
+class TokenVerifierTest(TestCase):
+
+    def setUp(self):
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.verifier = TokenVerifier(StaticKey(self.private_key.public_key()), cache=VerifiedTokenCache())
+
+    def token(self, **claims):
+        claims.setdefault('exp', int(time.time()) + 300)
+        return jwt.encode(claims, self.private_key, algorithm='RS256')
+
+    def test_repeat_verification_skips_signature_check(self):
+        token = self.token(user_id=1)
+        self.verifier.verify(token)
+
+        with mock.patch('jwt_auth.verifier.jwt.decode') as decode:
+            payload = self.verifier.verify(token)
+
+        decode.assert_not_called()
+        self.assertEqual(payload['user_id'], 1)
+
+    def test_algorithm_follows_key_type(self):
+        for private_key, algorithm in [
+            (ec.generate_private_key(ec.SECP256R1()), 'ES256'),
+            (ed25519.Ed25519PrivateKey.generate(), 'EdDSA'),
+        ]:
+            verifier = TokenVerifier(StaticKey(private_key.public_key()))
+            token = jwt.encode({'user_id': 1}, private_key, algorithm=algorithm)
+            self.assertEqual(verifier.verify(token)['user_id'], 1)
+
+            # An RSA-signed token must not be accepted under another key's algorithm.
+            with self.assertRaises(jwt.InvalidTokenError):
+                verifier.verify(self.token(user_id=1))
+
+    def test_rejects_tampered_token(self):
+        token = self.token(user_id=1)
+        header, payload, signature = token.split('.')
+        forged = '.'.join([header, self.token(user_id=2).split('.')[1], signature])
+
+        with self.assertRaises(jwt.InvalidSignatureError):
+            self.verifier.verify(forged)
+
+
+class JWKSKeySetTest(TestCase):
+
+    def setUp(self):
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self.private_key.public_key()))
+        jwk.update(kid='k1', alg='RS256', use='sig')
+        self.ed_key = ed25519.Ed25519PrivateKey.generate()
+        ed_jwk = json.loads(jwt.algorithms.OKPAlgorithm.to_jwk(self.ed_key.public_key()))
+        ed_jwk.update(kid='k2', alg='EdDSA', use='sig')
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'jwks.json')
+        with open(self.path, 'w') as f:
+            json.dump({'keys': [jwk, ed_jwk]}, f)
+
+        self.key_set = JWKSKeySet(f'file://{self.path}')
+        # Drive refreshes by hand instead of from the background thread.
+        self.key_set._pid = os.getpid()
+
+    def token(self, kid):
+        claims = {'user_id': 1, 'exp': int(time.time()) + 300}
+        return jwt.encode(claims, self.private_key, algorithm='RS256', headers={'kid': kid})
+
+    def test_verifies_with_key_named_by_kid(self):
+        self.assertTrue(self.key_set.refresh())
+        payload = TokenVerifier(self.key_set).verify(self.token('k1'))
+        self.assertEqual(payload['user_id'], 1)
+
+    def test_accepts_both_algorithms_during_migration(self):
+        self.key_set.refresh()
+        verifier = TokenVerifier(self.key_set)
+        ed_token = jwt.encode({'user_id': 2}, self.ed_key, algorithm='EdDSA', headers={'kid': 'k2'})
+
+        self.assertEqual(verifier.verify(self.token('k1'))['user_id'], 1)
+        self.assertEqual(verifier.verify(ed_token)['user_id'], 2)
+
+    def test_failed_refresh_keeps_known_keys(self):
+        self.key_set.refresh()
+        os.remove(self.path)
+
+        self.assertFalse(self.key_set.refresh())
+        self.assertIsNotNone(self.key_set.resolve('k1'))
+
+    def test_start_fetches_keys_before_the_first_lookup(self):
+        key_set = JWKSKeySet(f'file://{self.path}', fallback=mock.Mock())
+
+        with mock.patch('jwt_auth.jwks.threading.Thread'):
+            key_set.start()
+            key, algorithms = key_set.resolve('k1')
+
+        self.assertEqual(algorithms, ['RS256'])
+        key_set.fallback.resolve.assert_not_called()
+
+    def test_lookup_never_fetches_keys(self):
+        key_set = JWKSKeySet(f'file://{self.path}', fallback=mock.Mock())
+
+        with mock.patch('jwt_auth.jwks.threading.Thread') as thread, \
+                mock.patch('jwt_auth.jwks.urllib.request.urlopen') as urlopen:
+            key_set.resolve('k1')
+
+        urlopen.assert_not_called()
+        key_set.fallback.resolve.assert_called_once_with('k1')
+        # The refresher is started and told to fetch straight away.
+        thread.return_value.start.assert_called_once()
+        self.assertTrue(key_set._wake.is_set())
+
+    def test_unknown_kid_is_rejected(self):
+        self.key_set.refresh()
+        with self.assertRaises(jwt.InvalidTokenError):
+            TokenVerifier(self.key_set).verify(self.token('rotated-out'))
@@ -0,0 +1,16 @@
+"""
+One KafkaProducer per process, built lazily from Django settings:
+
+    KAFKA_BOOTSTRAP_SERVERS       required
+    KAFKA_PRODUCER_LINGER_MS      linger_ms
+    KAFKA_PRODUCER_MAX_BLOCK_MS   max_block_ms
+    KAFKA_PRODUCER_BATCH_SIZE     batch_size
+    KAFKA_PRODUCER_COMPRESSION    compression_type
+
+Optional settings that are not defined keep kafka-python's own defaults.
+Values are JSON-encoded; keys are sent as their str(), and messages sent
+without a key stay keyless. The
+producer is thread-safe, so every request thread shares it; it is rebuilt
+after fork() and flushed on interpreter exit.
+"""
+from .producer import get_producer  # noqa: F401
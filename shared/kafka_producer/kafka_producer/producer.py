@@ -0,0 +1,77 @@
+import atexit
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+from kafka import KafkaProducer
+
+logger = logging.getLogger(__name__)
+
+_producer = None
+_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    """
+    The parent's producer owns sockets and an I/O thread that do not survive
+    fork(). Drop the reference so the child builds its own on first use.
+    """
+    global _producer, _lock
+    _producer = None
+    _lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# Django setting -> KafkaProducer option, passed only when the setting exists.
+OPTIONAL_SETTINGS = {
+    'KAFKA_PRODUCER_LINGER_MS': 'linger_ms',
+    'KAFKA_PRODUCER_MAX_BLOCK_MS': 'max_block_ms',
+    'KAFKA_PRODUCER_BATCH_SIZE': 'batch_size',
+    'KAFKA_PRODUCER_COMPRESSION': 'compression_type',
+}
+
+
+def _serialize_key(key):
+    # kafka-python calls the key serializer even for send(key=None); keyless
+    # messages must stay keyless so they spread across partitions.
+    return None if key is None else str(key).encode('utf-8')
+
+
+def _create_producer():
+    options = {
+        option: getattr(settings, name)
+        for name, option in OPTIONAL_SETTINGS.items()
+        if hasattr(settings, name)
+    }
+    return KafkaProducer(
+        bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+        key_serializer=_serialize_key,
+        value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+        **options,
+    )
+
+
+def get_producer():
+    """
+    Returns the process-wide KafkaProducer, creating it on first use.
+    """
+    global _producer
+    if _producer is None:
+        with _lock:
+            if _producer is None:
+                _producer = _create_producer()
+    return _producer
+
+
+@atexit.register
+def _close_on_exit():
+    if _producer is not None:
+        try:
+            _producer.close(timeout=5)
+        except Exception as e:
+            logger.warning("Kafka error while closing producer: %s", e)
@@ -0,0 +1,22 @@
+"""
+Runs the user_replica tests against an in-memory SQLite database:
+
+    python runtests.py
+"""
+import sys
+
+import django
+from django.conf import settings
+from django.test.utils import get_runner
+
+settings.configure(
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    INSTALLED_APPS=['user_replica'],
+    DEFAULT_AUTO_FIELD='django.db.models.BigAutoField',
+    USE_TZ=True,
+)
+
+if __name__ == '__main__':
+    django.setup()
+    failures = get_runner(settings)().run_tests(['tests'])
+    sys.exit(bool(failures))
@@ -0,0 +1,58 @@
+from django.test import TestCase
+
+from user_replica.models import UserReplica
+from user_replica.replica import apply_events, get_users
+
+
+def event(user_id, occurred_at, **fields):
+    return {
+        'event_type': 'user_updated',
+        'user_id': user_id,
+        'email': f'user{user_id}@example.com',
+        'first_name': 'First',
+        'last_name': None,
+        'role': 'user',
+        'is_active': True,
+        'profile_picture': None,
+        'occurred_at': occurred_at,
+        **fields,
+    }
+
+
+class ApplyEventsTest(TestCase):
+
+    def test_upserts_newest_event_per_user(self):
+        apply_events([
+            event(1, '2026-01-01T10:00:00+00:00', first_name='Ada'),
+            event(2, '2026-01-01T10:00:00+00:00'),
+            event(1, '2026-01-01T11:00:00+00:00', first_name='Ada', last_name='Lovelace'),
+        ])
+
+        users = get_users([1, 2, 3])
+        self.assertEqual(sorted(users), [1, 2])
+        self.assertEqual(users[1].full_name, 'Ada Lovelace')
+
+    def test_skips_events_the_replica_cannot_store(self):
+        bad = event(2, '2026-01-01T10:00:00+00:00')
+        del bad['first_name']
+        with self.assertLogs('user_replica.replica', level='WARNING') as logs:
+            written = apply_events([
+                event(1, '2026-01-01T10:00:00+00:00'),
+                bad,
+                event(3, '2026-01-01T10:00:00+00:00', is_active=None),
+                event(4, '2026-01-01T10:00:00+00:00', first_name='x' * 31),
+            ])
+
+        self.assertEqual(written, 1)
+        self.assertEqual(sorted(get_users([1, 2, 3, 4])), [1])
+        self.assertEqual(len(logs.output), 3)
+
+    def test_ignores_events_older_than_the_replica(self):
+        apply_events([event(1, '2026-01-01T11:00:00+00:00', is_active=False)])
+        written = apply_events([event(1, '2026-01-01T10:00:00+00:00', is_active=True)])
+
+        self.assertEqual(written, 0)
+        self.assertFalse(UserReplica.objects.get(user_id=1).is_active)
+
+    def test_skips_malformed_events(self):
+        self.assertEqual(apply_events([{'user_id': 'x'}, event(5, '2026-01-01T10:00:00+00:00')]), 1)
@@ -0,0 +1,7 @@
+"""
+Django app holding a local copy of user profiles, fed by user-service's
+user_registered / user_updated / user_deactivated events.
+
+Add 'user_replica' to INSTALLED_APPS, set USER_REPLICA_CONSUMER_GROUP to a
+name unique to the service, and run `manage.py consume_user_events`.
+"""
@@ -0,0 +1,76 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+from kafka import KafkaConsumer
+
+from user_replica.replica import apply_events
+
+
+def _deserialize(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Keeps the local user replica current from user-service's user events. "
+        "Offsets are committed only after each batch is written, so a restart "
+        "re-applies at most one batch, which is harmless. Events the replica "
+        "cannot store are reported and skipped, so they cannot stall the consumer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-records', type=int, default=500)
+        parser.add_argument('--poll-timeout-ms', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        group_id = getattr(settings, 'USER_REPLICA_CONSUMER_GROUP', None)
+        if not group_id:
+            raise CommandError("Set USER_REPLICA_CONSUMER_GROUP to a consumer group unique to this service.")
+
+        consumer = KafkaConsumer(
+            getattr(settings, 'USER_EVENTS_TOPIC', 'user-events'),
+            bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+            group_id=group_id,
+            enable_auto_commit=False,
+            # A new replica starts from the oldest retained event.
+            auto_offset_reset='earliest',
+            value_deserializer=_deserialize,
+        )
+        self.stdout.write(f"Consuming user events as {group_id}")
+
+        try:
+            while True:
+                batch = consumer.poll(timeout_ms=options['poll_timeout_ms'], max_records=options['max_records'])
+                events = [
+                    record.value for records in batch.values() for record in records
+                    if isinstance(record.value, dict)
+                ]
+                if events:
+                    written = self.apply(events)
+                    self.stdout.write(f"Applied {written} of {len(events)} user events")
+                if batch:
+                    consumer.commit()
+        finally:
+            consumer.close()
+
+    def apply(self, events):
+        try:
+            with transaction.atomic():
+                return apply_events(events)
+        except DatabaseError as e:
+            self.stderr.write(f"⚠️ User event batch failed ({e}); applying events one by one")
+
+        # Isolate the event the database refuses and commit past it.
+        written = 0
+        for event in events:
+            try:
+                with transaction.atomic():
+                    written += apply_events([event])
+            except DatabaseError as e:
+                self.stderr.write(f"⚠️ Skipping user event the replica cannot store: {event!r}: {e}")
+        return written
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserReplica',
+            fields=[
+                ('user_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('email', models.EmailField(max_length=254)),
+                ('first_name', models.CharField(max_length=30)),
+                ('last_name', models.CharField(blank=True, max_length=30, null=True)),
+                ('role', models.CharField(max_length=10)),
+                ('is_active', models.BooleanField(default=True)),
+                ('profile_picture', models.CharField(blank=True, max_length=255, null=True)),
+                ('updated_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class UserReplica(models.Model):
+    """
+    Read-only copy of a user's public profile. Written only by
+    consume_user_events; user-service remains the source of truth.
+    """
+    user_id = models.BigIntegerField(primary_key=True)
+    email = models.EmailField()
+    first_name = models.CharField(max_length=30)
+    last_name = models.CharField(max_length=30, blank=True, null=True)
+    role = models.CharField(max_length=10)
+    is_active = models.BooleanField(default=True)
+    profile_picture = models.CharField(max_length=255, blank=True, null=True)
+    # occurred_at of the newest event applied; older events are ignored.
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.email
+
+    @property
+    def full_name(self):
+        return ' '.join(filter(None, [self.first_name, self.last_name]))
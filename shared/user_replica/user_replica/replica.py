@@ -0,0 +1,77 @@
+import logging
+
+from django.core.exceptions import ValidationError
+from django.utils.dateparse import parse_datetime
+
+from .models import UserReplica
+
+logger = logging.getLogger(__name__)
+
+REPLICATED_FIELDS = ('email', 'first_name', 'last_name', 'role', 'is_active', 'profile_picture')
+
+
+def _parse(event):
+    """
+    Returns (user_id, occurred_at, UserReplica) for a well-formed event, or
+    raises ValueError. Fields are checked against the model (required,
+    max_length, email) so one bad event cannot fail the batch's insert.
+    """
+    try:
+        user_id = int(event['user_id'])
+        occurred_at = parse_datetime(event['occurred_at'])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"bad user_id or occurred_at: {e}")
+    if occurred_at is None:
+        raise ValueError("bad occurred_at")
+    if not isinstance(event.get('is_active'), bool):
+        raise ValueError("is_active must be a boolean")
+
+    row = UserReplica(
+        user_id=user_id,
+        updated_at=occurred_at,
+        **{field: event.get(field) for field in REPLICATED_FIELDS},
+    )
+    try:
+        row.clean_fields()
+    except ValidationError as e:
+        raise ValueError(e.message_dict)
+    return user_id, occurred_at, row
+
+
+def apply_events(events):
+    """
+    Upserts the replica from a batch of user events and returns how many rows
+    were written. Only the newest event per user is kept, and only if it is
+    newer than the stored row, so redelivered or reordered events are harmless.
+    Malformed events are logged and skipped.
+    """
+    latest = {}
+    for event in events:
+        try:
+            user_id, occurred_at, row = _parse(event)
+        except ValueError as e:
+            logger.warning("Skipping malformed user event %r: %s", event, e)
+            continue
+        if user_id not in latest or latest[user_id][0] < occurred_at:
+            latest[user_id] = (occurred_at, row)
+
+    stored = dict(UserReplica.objects.filter(user_id__in=latest).values_list('user_id', 'updated_at'))
+    rows = [
+        row for user_id, (occurred_at, row) in latest.items()
+        if user_id not in stored or stored[user_id] <= occurred_at
+    ]
+    UserReplica.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['user_id'],
+        update_fields=[*REPLICATED_FIELDS, 'updated_at'],
+    )
+    return len(rows)
+
+
+def get_users(user_ids):
+    """
+    Maps each known user id to its UserReplica in one query. Ids the replica
+    has not seen yet are simply absent.
+    """
+    return UserReplica.objects.in_bulk(list(user_ids))
@@ -7,6 +7,7 @@ https://docs.djangoproject.com/en/4.2/topics/settings/
 
 from pathlib import Path
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 import os
 from datetime import timedelta
 
@@ -28,6 +29,11 @@ DEBUG = True
 ALLOWED_HOSTS = []
 
 # Application definition
+# 'api' or 'full' (admin/ only in full); see SERVICE_PROFILE in docker-compose.yml.
+SERVICE_PROFILE = os.getenv('SERVICE_PROFILE', 'full')
+if SERVICE_PROFILE not in ('api', 'full'):
+    raise ImproperlyConfigured(f"SERVICE_PROFILE must be 'api' or 'full', not {SERVICE_PROFILE!r}")
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -52,6 +58,17 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if SERVICE_PROFILE == 'api':
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS
+        if app not in ('django.contrib.admin', 'django.contrib.sessions',
+                       'django.contrib.messages', 'django.contrib.staticfiles')
+    ]
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.common.CommonMiddleware',
+    ]
+
 ROOT_URLCONF = 'user_service.urls'
 
 TEMPLATES = [
@@ -91,6 +108,9 @@ REST_FRAMEWORK = {
     ),
 }
 
+if SERVICE_PROFILE == 'api':
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ['rest_framework.renderers.JSONRenderer']
+
 # Read JWT keys safely
 def read_key(path):
     key_path = BASE_DIR / path
@@ -102,15 +122,60 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': True,
-    'BLACKLIST_AFTER_ROTATION': True,
+    # simplejwt's blacklist app is not installed; users.revocation revokes
+    # rotated refresh tokens instead (see TokenRefreshSerializer).
+    'BLACKLIST_AFTER_ROTATION': False,
+    # Only used by simplejwt's stock token backend; the key ring picks each
+    # key's algorithm from its type (RSA, EC P-256 or Ed25519).
     'ALGORITHM': 'RS256',
     'SIGNING_KEY': read_key(os.getenv("JWT_PRIVATE_KEY_PATH")),
     'VERIFYING_KEY': read_key(os.getenv("JWT_PUBLIC_KEY_PATH")),
     'AUTH_HEADER_TYPES': ('Bearer',),
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
+    # Signed and verified through users.keys.KeyRing, which adds a `kid` header.
+    'AUTH_TOKEN_CLASSES': ('users.tokens.AccessToken',),
+    # Returned by JWTStatelessUserAuthentication: a user built from claims, no query.
+    'TOKEN_USER_CLASS': 'users.profiles.ClaimsUser',
 }
 
+# Refresh token revocation (users.revocation). Each process keeps a bloom filter
+# sized for REVOCATION_BLOOM_CAPACITY live revocations, pulls in revocations made
+# by other workers every REVOCATION_SYNC_SECONDS and rebuilds it from the table
+# every REVOCATION_REBUILD_SECONDS. Run prune_revoked_tokens periodically.
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", 1_000_000))
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", 2))
+REVOCATION_REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", 3600))
+
+# How long each process reuses profile fields that are not in the token.
+PROFILE_CACHE_SECONDS = int(os.getenv("PROFILE_CACHE_SECONDS", 60))
+
+# Public keys of retired signing keys (comma-separated paths). They stay in the
+# JWKS document and keep verifying until the tokens they signed have expired.
+JWT_PREVIOUS_PUBLIC_KEYS = [
+    read_key(path.strip())
+    for path in os.getenv("JWT_PREVIOUS_PUBLIC_KEY_PATHS", "").split(",")
+    if path.strip()
+]
+
+KAFKA_BOOTSTRAP_SERVERS = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "kafka:9092")
+KAFKA_PRODUCER_LINGER_MS = int(os.getenv("KAFKA_PRODUCER_LINGER_MS", 5))
+KAFKA_PRODUCER_MAX_BLOCK_MS = int(os.getenv("KAFKA_PRODUCER_MAX_BLOCK_MS", 1000))
+# user_registered / user_updated / user_deactivated, consumed by shared/user_replica.
+USER_EVENTS_TOPIC = os.getenv("USER_EVENTS_TOPIC", "user-events")
+
+# Largest number of ids accepted by the batch user lookup (accounts/v1/users/?ids=).
+USER_BATCH_MAX_IDS = int(os.getenv("USER_BATCH_MAX_IDS", 100))
+
+# Password hashes run on a bounded pool (users.hashing): PASSWORD_HASH_WORKERS
+# threads plus PASSWORD_HASH_QUEUE waiting. A request that cannot get a slot
+# within PASSWORD_HASH_WAIT_SECONDS is answered 503 with Retry-After.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+# Each queued hash adds roughly one hash time to the wait, so keep the queue short.
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", 2 * PASSWORD_HASH_WORKERS))
+PASSWORD_HASH_WAIT_SECONDS = float(os.getenv("PASSWORD_HASH_WAIT_SECONDS", 0.1))
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", 1))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -0,0 +1,47 @@
+"""
+User lifecycle events for the other services' user replicas.
+
+Events go to USER_EVENTS_TOPIC keyed by user id, so each user's events stay
+in order on one partition. Every event carries the full public profile:
+a consumer can upsert its replica from any single event.
+"""
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+from kafka_producer import get_producer
+
+logger = logging.getLogger(__name__)
+
+USER_REGISTERED = 'user_registered'
+USER_UPDATED = 'user_updated'
+USER_DEACTIVATED = 'user_deactivated'
+
+
+def user_event(event_type, user):
+    return {
+        'event_type': event_type,
+        'user_id': user.id,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'role': user.role,
+        'is_active': user.is_active,
+        'profile_picture': user.profile_picture.name or None,
+        # Consumers drop events older than what they already applied.
+        'occurred_at': timezone.now().isoformat(),
+    }
+
+
+def publish_user_event(event_type, user):
+    message = user_event(event_type, user)
+    topic = settings.USER_EVENTS_TOPIC
+    try:
+        future = get_producer().send(topic, key=user.id, value=message)
+    except Exception as e:
+        logger.warning("Kafka error on %s: %s", topic, e)
+        return None
+
+    # The errback is called with the exception appended to these arguments.
+    future.add_errback(logger.warning, "Kafka error on %s: %s", topic)
+    return future
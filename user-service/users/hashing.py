@@ -0,0 +1,80 @@
+"""
+Password hashing off the request thread.
+
+Hashers are slow on purpose. Run on request threads, a burst of logins ties
+up every worker and starves the other endpoints. Hashes run on a small fixed
+pool instead, with a short queue in front of it. When both are full, callers
+get HashingPoolSaturated right away and the views answer 503 with Retry-After.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class HashingPoolSaturated(Exception):
+    """
+    Raised when no hashing slot frees up within PASSWORD_HASH_WAIT_SECONDS.
+    """
+
+
+# One pool per process; `_slots` counts running plus queued hashes.
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    """
+    Worker threads do not survive fork(); the child builds its own pool.
+    """
+    global _executor, _slots, _lock
+    _executor = None
+    _slots = None
+    _lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _get_pool():
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = settings.PASSWORD_HASH_WORKERS
+                _slots = threading.BoundedSemaphore(workers + settings.PASSWORD_HASH_QUEUE)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+    return _executor, _slots
+
+
+def run(func, *args):
+    """
+    Runs func(*args) on the hashing pool and waits for its result.
+    """
+    executor, slots = _get_pool()
+    if not slots.acquire(timeout=settings.PASSWORD_HASH_WAIT_SECONDS):
+        raise HashingPoolSaturated()
+
+    try:
+        future = executor.submit(func, *args)
+    except BaseException:
+        slots.release()
+        raise
+    # The slot is freed when the hash finishes, even if the caller gave up.
+    future.add_done_callback(lambda _: slots.release())
+    return future.result()
+
+
+def make_password(password):
+    return run(hashers.make_password, password)
+
+
+def verify_password(password, encoded):
+    """
+    Returns (is_correct, must_update), as django.contrib.auth.hashers does.
+    """
+    return run(hashers.verify_password, password, encoded)
@@ -0,0 +1,92 @@
+import base64
+import hashlib
+import json
+from functools import lru_cache
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm, RSAAlgorithm
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+# Key type -> (JWS algorithm, PyJWT algorithm class, members hashed into the RFC 7638 thumbprint).
+KEY_TYPES = {
+    rsa.RSAPublicKey: ('RS256', RSAAlgorithm, ('e', 'kty', 'n')),
+    ec.EllipticCurvePublicKey: ('ES256', ECAlgorithm, ('crv', 'kty', 'x', 'y')),
+    ed25519.Ed25519PublicKey: ('EdDSA', OKPAlgorithm, ('crv', 'kty', 'x')),
+}
+
+
+def key_type(public_key):
+    for cls, spec in KEY_TYPES.items():
+        if isinstance(public_key, cls):
+            # ES256 is only defined over P-256; other curves would need ES384/ES512.
+            if cls is not ec.EllipticCurvePublicKey or isinstance(public_key.curve, ec.SECP256R1):
+                return spec
+    raise ImproperlyConfigured(
+        f"Unsupported JWT key type {type(public_key).__name__}: use RSA, EC P-256 or Ed25519."
+    )
+
+
+class SigningKey:
+    """
+    One entry of the key ring: a public key identified by `kid`, plus the
+    private key when this is the key new tokens are signed with.
+
+    The algorithm follows from the key type (RSA -> RS256, P-256 -> ES256,
+    Ed25519 -> EdDSA), so switching algorithms is just rotating in a key of
+    another type.
+    """
+
+    def __init__(self, public_pem, private_pem=None):
+        self.public_key = load_pem_public_key(public_pem.encode('utf-8'))
+        self.private_key = load_pem_private_key(private_pem.encode('utf-8'), password=None) if private_pem else None
+        self.algorithm, self._algorithm_class, self._thumbprint_members = key_type(self.public_key)
+        self.kid = self.thumbprint()
+
+    def public_jwk(self):
+        return json.loads(self._algorithm_class.to_jwk(self.public_key))
+
+    def thumbprint(self):
+        """
+        RFC 7638 JWK thumbprint: stable for a given key, so the kid never
+        needs to be configured by hand.
+        """
+        jwk = self.public_jwk()
+        required = {name: jwk[name] for name in self._thumbprint_members}
+        canonical = json.dumps(required, separators=(',', ':'), sort_keys=True)
+        return _b64url(hashlib.sha256(canonical.encode('utf-8')).digest())
+
+    def jwk(self):
+        return {**self.public_jwk(), 'kid': self.kid, 'alg': self.algorithm, 'use': 'sig'}
+
+
+class KeyRing:
+    """
+    The current signing key and every key whose tokens are still accepted.
+    Keys may use different algorithms, so an RS256 ring can move to EdDSA
+    while RS256 tokens already issued keep verifying.
+    """
+
+    def __init__(self, current, previous=()):
+        self.current = current
+        self.keys = {key.kid: key for key in (current, *previous)}
+
+    def get(self, kid):
+        return self.keys.get(kid)
+
+    def jwks(self):
+        return {'keys': [key.jwk() for key in self.keys.values()]}
+
+
+@lru_cache(maxsize=None)
+def get_key_ring():
+    jwt_settings = settings.SIMPLE_JWT
+    current = SigningKey(jwt_settings['VERIFYING_KEY'], private_pem=jwt_settings['SIGNING_KEY'])
+    previous = [SigningKey(pem) for pem in settings.JWT_PREVIOUS_PUBLIC_KEYS]
+    return KeyRing(current, previous)
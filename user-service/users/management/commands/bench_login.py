@@ -0,0 +1,73 @@
+import collections
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures login throughput against a running user-service, e.g.\n"
+        "  bench_login --url http://localhost:8001/accounts/v1/token/ --create-user --concurrency 50\n"
+        "Reports successful logins per second, latency, and how many requests "
+        "were shed with 503 by the password hashing pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', required=True, help="Token endpoint URL.")
+        parser.add_argument('--email', default='bench-login@example.com')
+        parser.add_argument('--password', default='bench-login-password')
+        parser.add_argument('--create-user', action='store_true',
+                            help="Create (or reset) the benchmark account in this service's database first.")
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if options['create_user']:
+            self.create_user(options['email'], options['password'])
+
+        body = json.dumps({'email': options['email'], 'password': options['password']}).encode('utf-8')
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(lambda _: self.login(options['url'], body), range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        statuses = collections.Counter(code for code, _ in results)
+        latencies = sorted(latency for code, latency in results if code == 200)
+        if not latencies:
+            raise CommandError(f"No successful logins: {dict(statuses)}")
+
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{len(latencies) / elapsed:.1f} logins/s, "
+            f"p50 {statistics.median(latencies) * 1000:.0f} ms, p99 {p99 * 1000:.0f} ms "
+            f"({options['concurrency']} concurrent, {elapsed:.1f}s)"
+        )
+        self.stdout.write(f"status codes: {dict(sorted(statuses.items()))}")
+
+    def create_user(self, email, password):
+        User = get_user_model()
+        user = User.objects.filter(email=email).first()
+        if user is None:
+            User.objects.create_user(email=email, password=password, first_name='Bench')
+        else:
+            user.set_password(password)
+            user.save(update_fields=['password'])
+
+    def login(self, url, body):
+        request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                code = response.status
+        except urllib.error.HTTPError as e:
+            code = e.code
+        except (urllib.error.URLError, OSError):
+            code = 0
+        return code, time.perf_counter() - started
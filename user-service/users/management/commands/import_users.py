@@ -0,0 +1,220 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+
+User = get_user_model()
+
+ROLES = {role for role, _ in User.ROLE_CHOICES}
+MAX_LENGTHS = {name: User._meta.get_field(name).max_length for name in ('email', 'first_name', 'last_name')}
+
+
+def _init_worker():
+    # Spawned workers start without Django configured; make_password reads PASSWORD_HASHERS.
+    django.setup()
+
+
+def read_rows(path, fmt):
+    """
+    Yields (row_number, row) lazily; row is None when the line cannot be parsed.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            for number, row in enumerate(csv.DictReader(f), start=1):
+                yield number, row
+            return
+
+        for number, line in enumerate(f, start=1):
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+
+
+def clean_row(row):
+    """
+    Returns (user fields, raw password or None) or raises ValidationError.
+    Rows may carry `password_hash` (an encoded Django hash from the old
+    system) instead of `password`; it is stored as is.
+    """
+    if row is None:
+        raise ValidationError("Unparseable row")
+
+    def value(name):
+        return str(row.get(name) or '').strip()
+
+    email = User.objects.normalize_email(value('email'))
+    validate_email(email)
+    first_name = value('first_name')
+    if not first_name:
+        raise ValidationError("first_name is required")
+    last_name = value('last_name') or None
+    role = value('role') or 'user'
+    if role not in ROLES:
+        raise ValidationError(f"Unknown role {role!r}")
+
+    fields = {'email': email, 'first_name': first_name, 'last_name': last_name, 'role': role}
+    for name, max_length in MAX_LENGTHS.items():
+        if fields[name] and len(fields[name]) > max_length:
+            raise ValidationError(f"{name} is longer than {max_length} characters")
+
+    password_hash = value('password_hash')
+    if password_hash:
+        try:
+            identify_hasher(password_hash)
+        except ValueError:
+            raise ValidationError("password_hash is not a recognised Django password hash")
+        fields['password'] = password_hash
+        return fields, None
+
+    password = row.get('password')
+    if not password:
+        raise ValidationError("password or password_hash is required")
+    if not isinstance(password, str):
+        # NDJSON can carry numbers or objects; make_password would raise in the pool.
+        raise ValidationError("password must be a string")
+    return fields, password
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports users from a CSV (with a header row) or NDJSON file with the "
+        "fields email, first_name, last_name, role and password or password_hash. "
+        "Rows are streamed, hashed on a process pool and inserted with bulk_create. "
+        "Progress is checkpointed after every chunk, so an interrupted import "
+        "resumes where it stopped when run again. Emails that already exist are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'ndjson'],
+                            help="Defaults to the file extension (.csv, otherwise NDJSON).")
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Hashing processes.")
+        parser.add_argument('--checkpoint', help="Defaults to <path>.checkpoint.")
+        parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint.")
+        parser.add_argument('--rejects', help="Write rejected rows and their errors to this NDJSON file.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"No such file: {path}")
+        fmt = options['format'] or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        self.checkpoint_path = options['checkpoint'] or f"{path}.checkpoint"
+
+        checkpoint = {} if options['restart'] else self.read_checkpoint()
+        done = checkpoint.get('rows', 0)
+        if done:
+            self.stdout.write(f"Resuming after row {done}")
+
+        rows = islice(read_rows(path, fmt), done, None)
+        rejects = open(options['rejects'], 'a', encoding='utf-8') if options['rejects'] else None
+        if rejects and checkpoint.get('rejects_offset') is not None:
+            # Drop rejects written for chunks after the checkpoint; they are read again.
+            # truncate() leaves the position (and so tell()) where it was.
+            rejects.truncate(checkpoint['rejects_offset'])
+            rejects.seek(checkpoint['rejects_offset'])
+        self.stats = {'read': done, 'written': 0, 'rejected': 0}
+        users_before = User.objects.count()
+        self.started = time.perf_counter()
+
+        try:
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+                self.run(rows, pool, options, rejects)
+        finally:
+            if rejects:
+                rejects.close()
+
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        created = User.objects.count() - users_before
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {created} users, skipped {self.stats['written'] - created} existing emails, "
+            f"rejected {self.stats['rejected']} rows in {time.perf_counter() - self.started:.1f}s"
+        ))
+
+    def run(self, rows, pool, options, rejects):
+        chunk_size = options['chunk_size']
+        hash_batch = max(1, chunk_size // (options['workers'] * 4))
+        pending = None
+
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk and pending is None:
+                break
+
+            # Hash this chunk in the pool while the previous one is inserted.
+            submitted = None
+            if chunk:
+                users, passwords = self.validate(chunk, rejects)
+                to_hash = [password for password in passwords if password is not None]
+                # Where this chunk's rejects end; the next chunk's are written before this one commits.
+                rejects_offset = rejects.tell() if rejects else None
+                submitted = (users, passwords, pool.map(make_password, to_hash, chunksize=hash_batch),
+                             len(chunk), rejects_offset)
+
+            if pending is not None:
+                self.insert(*pending, batch_size=chunk_size)
+            pending = submitted
+
+    def validate(self, chunk, rejects):
+        users, passwords = [], []
+        for number, row in chunk:
+            try:
+                fields, password = clean_row(row)
+            except ValidationError as e:
+                self.stats['rejected'] += 1
+                if rejects:
+                    rejects.write(json.dumps({'row': number, 'errors': e.messages, 'data': row}) + '\n')
+                continue
+            users.append(User(**fields))
+            passwords.append(password)
+        return users, passwords
+
+    def insert(self, users, passwords, hashes, rows_read, rejects_offset, batch_size):
+        hashes = iter(hashes)
+        for user, password in zip(users, passwords):
+            if password is not None:
+                user.password = next(hashes)
+
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=batch_size, ignore_conflicts=True)
+
+        self.stats['read'] += rows_read
+        self.stats['written'] += len(users)
+        self.write_checkpoint(self.stats['read'], rejects_offset)
+
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(
+            f"{self.stats['read']} rows read, {self.stats['written']} written, "
+            f"{self.stats['rejected']} rejected ({self.stats['written'] / elapsed:.0f} users/s)"
+        )
+
+    def read_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+            return {'rows': int(checkpoint['rows']), 'rejects_offset': checkpoint.get('rejects_offset')}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise CommandError(f"Unreadable checkpoint {self.checkpoint_path}: {e}; use --restart")
+
+    def write_checkpoint(self, rows, rejects_offset):
+        # Written only after the chunk's transaction commits; replaced atomically.
+        tmp = f"{self.checkpoint_path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'rows': rows, 'rejects_offset': rejects_offset}, f)
+        os.replace(tmp, self.checkpoint_path)
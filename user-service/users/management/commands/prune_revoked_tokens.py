@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes revocations of refresh tokens that have expired anyway, in small "
+        "batches so the table is never locked for long. Run it periodically (e.g. hourly)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help="Seconds to sleep between batches.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = RevokedToken.objects.filter(expires_at__lte=now)
+        deleted = 0
+
+        while True:
+            batch = list(expired.values_list('jti', flat=True)[:options['batch_size']])
+            if not batch:
+                break
+            deleted += RevokedToken.objects.filter(jti__in=batch).delete()[0]
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} expired revocations"))
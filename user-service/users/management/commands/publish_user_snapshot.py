@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from users.events import USER_DEACTIVATED, USER_UPDATED, get_producer, publish_user_event
+
+
+class Command(BaseCommand):
+    help = (
+        "Publishes the current state of every user to USER_EVENTS_TOPIC, to seed "
+        "new user replicas or to cover users created without signals (import_users)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by('id')
+        published = 0
+        for user in users.iterator(chunk_size=options['chunk_size']):
+            publish_user_event(USER_UPDATED if user.is_active else USER_DEACTIVATED, user)
+            published += 1
+        get_producer().flush()
+        self.stdout.write(self.style.SUCCESS(f"Published {published} user events"))
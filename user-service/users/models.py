@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 
+from . import hashing
+
 # Create your models here.
 
 class CustomBaseUserManager(BaseUserManager):
@@ -52,3 +54,33 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.email
+
+    # Both hash on the bounded pool in users.hashing and may raise
+    # HashingPoolSaturated. Every login, registration and admin path uses them.
+    def set_password(self, raw_password):
+        self.password = hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        is_correct, must_update = hashing.verify_password(raw_password, self.password)
+        if is_correct and must_update:
+            # The stored hash predates the current hasher or its work factor;
+            # upgrade it while we have the raw password.
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=['password'])
+        return is_correct
+
+
+class RevokedToken(models.Model):
+    """
+    A refresh token that may no longer be used, keyed by its `jti`. Rows are
+    only needed until the token would have expired anyway; see
+    prune_revoked_tokens.
+    """
+    jti = models.CharField(max_length=64, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
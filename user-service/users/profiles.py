@@ -0,0 +1,68 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+class ProfileCache:
+    """
+    Per-process cache of the profile fields that are not carried in the
+    access token, each entry kept for `ttl` seconds. Saving a user drops
+    their entry in the saving process (users.signals); other processes can
+    take up to `ttl` to see the change.
+    """
+
+    fields = ('profile_picture',)
+
+    def __init__(self, ttl, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        profile = get_user_model().objects.filter(id=user_id).values(*self.fields).first()
+        profile = profile or dict.fromkeys(self.fields)
+        with self._lock:
+            if len(self._entries) >= self.maxsize:
+                # Oldest insertion first; good enough for a short-lived cache.
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[user_id] = (time.monotonic() + self.ttl, profile)
+        return profile
+
+    def invalidate(self, user_id):
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+profile_cache = ProfileCache(ttl=settings.PROFILE_CACHE_SECONDS)
+
+
+class ClaimsUser(TokenUser):
+    """
+    Request user built from access token claims, without loading CustomUser.
+    email, role, first_name and last_name come from the token (see
+    RefreshToken.for_user); profile_picture comes from the profile cache.
+    Claims can be up to ACCESS_TOKEN_LIFETIME old.
+    """
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def profile_picture(self):
+        field = get_user_model()._meta.get_field('profile_picture')
+        name = profile_cache.get(self.id)['profile_picture']
+        # A FieldFile, so serializers render it exactly like the model field.
+        return field.attr_class(None, field, name or None)
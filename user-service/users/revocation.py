@@ -0,0 +1,161 @@
+"""
+Refresh token revocation with an in-process bloom filter in front of the
+RevokedToken table.
+
+Almost every token checked was never revoked. The filter answers that case
+without a query. Only a filter hit (a revoked token or a rare false positive)
+costs a primary-key lookup. Each process pulls rows revoked elsewhere into its
+filter every REVOCATION_SYNC_SECONDS, so a token revoked by another worker is
+refused by this one within that window. Revocations made by this process are
+visible to it at once.
+"""
+import hashlib
+import math
+import os
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .models import RevokedToken
+
+# Rows stamped slightly before the last sync are read again, to tolerate clock
+# skew between workers. Adding a jti twice is harmless.
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over strings; no false negatives, about
+    `error_rate` false positives once `capacity` items have been added.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        if item in self:
+            return
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationStore:
+
+    def __init__(self, capacity, sync_interval, rebuild_interval):
+        self.capacity = capacity
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self.reset()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def reset(self):
+        self._bloom = None
+        self._watermark = None
+        self._synced_at = 0.0
+        self._built_at = 0.0
+        self._rebuilding = False
+
+    def _after_fork(self):
+        # A rebuild thread running in the parent does not exist in the child.
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    def revoke(self, jti, expires_at):
+        """
+        Returns False if the token had already been revoked, which is how a
+        replayed refresh token is detected during rotation.
+        """
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+        except IntegrityError:
+            return False
+        # Under the lock so the add cannot fall between a rebuild's catch-up and its swap.
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+        return True
+
+    def is_revoked(self, jti):
+        self._refresh()
+        if jti not in self._bloom:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._bloom is not None and now - self._synced_at < self.sync_interval:
+            return
+
+        with self._lock:
+            if self._bloom is not None and now - self._synced_at < self.sync_interval:
+                return
+            if self._bloom is None:
+                # Nothing to answer from yet: the first request in a process waits.
+                self._bloom, self._watermark = self._build()
+                self._built_at = now
+            else:
+                self._watermark = self._sync(self._bloom, self._watermark)
+                # Rebuilding drops pruned rows and keeps the false-positive rate
+                # near its target. It scans the whole table, so it runs on its
+                # own thread while requests keep using the current filter.
+                if not self._rebuilding and (now - self._built_at >= self.rebuild_interval
+                                             or self._bloom.count > self.capacity):
+                    self._rebuilding = True
+                    threading.Thread(target=self._rebuild, name='revocation-rebuild', daemon=True).start()
+            self._synced_at = now
+
+    def _build(self):
+        started = timezone.now()
+        bloom = BloomFilter(self.capacity)
+        rows = RevokedToken.objects.filter(expires_at__gt=started).values_list('jti', flat=True)
+        for jti in rows.iterator(chunk_size=10000):
+            bloom.add(jti)
+        return bloom, started
+
+    def _rebuild(self):
+        try:
+            bloom, watermark = self._build()
+            with self._lock:
+                # Catch up on rows revoked during the scan, then swap the new filter in.
+                watermark = self._sync(bloom, watermark)
+                self._bloom, self._watermark, self._built_at = bloom, watermark, time.monotonic()
+        finally:
+            self._rebuilding = False
+            connection.close()
+
+    def _sync(self, bloom, watermark):
+        """
+        Adds rows revoked since watermark to bloom; returns the new watermark.
+        """
+        started = timezone.now()
+        rows = RevokedToken.objects.filter(revoked_at__gte=watermark - SYNC_OVERLAP)
+        for jti in rows.values_list('jti', flat=True):
+            bloom.add(jti)
+        return started
+
+
+revocation_store = RevocationStore(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    sync_interval=settings.REVOCATION_SYNC_SECONDS,
+    rebuild_interval=settings.REVOCATION_REBUILD_SECONDS,
+)
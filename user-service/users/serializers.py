@@ -1,6 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from .revocation import revocation_store
+from .tokens import PROFILE_CLAIMS, RefreshToken
 
 CustomUser = get_user_model()
 
@@ -11,18 +17,69 @@ class RegistrationSerializer(serializers.ModelSerializer):
         extra_kwargs = {'password': {'write_only': True}}
 
     def create(self, validated_data):
-        user = CustomUser.objects.create_user(**validated_data)
-        user.set_password(validated_data['password'])
-        user.save()
-        return user
+        # create_user hashes the password and saves; hashing it again here doubled the cost.
+        return CustomUser.objects.create_user(**validated_data)
     
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
-    @classmethod
-    def get_token(cls, user):
-        token = super().get_token(user)
-        # Add custom claims
-        token['email'] = user.email
-        token['role'] = user.role
-        return token
-    
-    
+    # Adds the email, role and name claims; see RefreshToken.for_user.
+    token_class = RefreshToken
+
+
+class RevocableRefreshSerializer(serializers.Serializer):
+    """
+    Base for endpoints that take a refresh token and must refuse revoked ones.
+    """
+    refresh = serializers.CharField()
+
+    def get_refresh_token(self, raw):
+        refresh = RefreshToken(raw)
+        if revocation_store.is_revoked(refresh[api_settings.JTI_CLAIM]):
+            raise InvalidToken("Token has been revoked")
+        return refresh
+
+    def revoke(self, refresh):
+        """
+        Returns False when another request revoked the token first.
+        """
+        return revocation_store.revoke(refresh[api_settings.JTI_CLAIM], datetime_from_epoch(refresh['exp']))
+
+
+class TokenRefreshSerializer(RevocableRefreshSerializer):
+    """
+    simplejwt's refresh flow, with rotation backed by users.revocation: the
+    presented refresh token is revoked before its replacement is issued, so
+    each refresh token can be used exactly once.
+    """
+    access = serializers.CharField(read_only=True)
+
+    def validate(self, attrs):
+        refresh = self.get_refresh_token(attrs['refresh'])
+
+        user = CustomUser.objects.filter(id=refresh[api_settings.USER_ID_CLAIM]).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed("No active account found for the given token.", "no_active_account")
+        # Refreshed tokens pick up profile changes made since login.
+        for claim in PROFILE_CLAIMS:
+            refresh[claim] = getattr(user, claim)
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if not self.revoke(refresh):
+                raise InvalidToken("Token has been revoked")
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+
+        return data
+
+
+class TokenRevokeSerializer(RevocableRefreshSerializer):
+    """
+    Revokes a refresh token, e.g. on logout.
+    """
+
+    def validate(self, attrs):
+        self.revoke(self.get_refresh_token(attrs['refresh']))
+        return {}
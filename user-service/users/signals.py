@@ -0,0 +1,33 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .events import USER_DEACTIVATED, USER_REGISTERED, USER_UPDATED, publish_user_event
+from .models import CustomUser
+from .profiles import profile_cache
+
+# Saves that touch none of the replicated fields (password upgrades, logins).
+PRIVATE_FIELDS = {'password', 'last_login'}
+
+
+@receiver(post_save, sender=CustomUser, dispatch_uid='users.publish_user_event')
+def publish_on_save(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields and set(update_fields) <= PRIVATE_FIELDS):
+        return
+
+    if created:
+        event_type = USER_REGISTERED
+    elif not instance.is_active:
+        event_type = USER_DEACTIVATED
+    else:
+        event_type = USER_UPDATED
+
+    # Only announce what was committed; a rolled-back save publishes nothing.
+    transaction.on_commit(lambda: publish_user_event(event_type, instance))
+
+
+@receiver(post_save, sender=CustomUser, dispatch_uid='users.invalidate_profile_cache')
+def invalidate_profile_on_save(sender, instance, created, raw=False, **kwargs):
+    # Other processes still catch up within PROFILE_CACHE_SECONDS.
+    if not raw and not created:
+        transaction.on_commit(lambda: profile_cache.invalidate(instance.id))
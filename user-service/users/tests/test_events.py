@@ -0,0 +1,44 @@
+# users/tests/test_events.py
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+User = get_user_model()
+
+
+@mock.patch('users.signals.publish_user_event')
+class UserEventTest(TestCase):
+
+    def create_user(self):
+        return User.objects.create_user(email='events@example.com', password='x', first_name='Eve')
+
+    def test_registration_publishes_after_commit(self, publish):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            user = self.create_user()
+        publish.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+        publish.assert_called_once_with('user_registered', user)
+
+    def test_updates_and_deactivation(self, publish):
+        user = self.create_user()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.first_name = 'Evelyn'
+            user.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            user.is_active = False
+            user.save()
+
+        self.assertEqual([c.args[0] for c in publish.call_args_list], ['user_updated', 'user_deactivated'])
+
+    def test_password_only_saves_are_not_published(self, publish):
+        user = self.create_user()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.set_password('new-password')
+            user.save(update_fields=['password'])
+
+        publish.assert_not_called()
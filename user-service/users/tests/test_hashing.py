@@ -0,0 +1,66 @@
+# users/tests/test_hashing.py
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users import hashing
+
+User = get_user_model()
+
+
+class HashingPoolTest(TestCase):
+
+    def setUp(self):
+        # Each test builds a pool sized by its own settings.
+        hashing._reset_after_fork()
+        self.addCleanup(hashing._reset_after_fork)
+
+    @override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=0, PASSWORD_HASH_WAIT_SECONDS=0)
+    def test_rejects_when_saturated(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_hash():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=hashing.run, args=(slow_hash,))
+        worker.start()
+        started.wait(5)
+        try:
+            with self.assertRaises(hashing.HashingPoolSaturated):
+                hashing.make_password('secret')
+        finally:
+            release.set()
+            worker.join()
+
+        self.assertTrue(hashing.make_password('secret'))
+
+    def test_login_upgrades_outdated_hash(self):
+        user = User.objects.create_user(email='old@example.com', password='x', first_name='Old')
+        User.objects.filter(pk=user.pk).update(password=make_password('testpass123', hasher='pbkdf2_sha1'))
+
+        user.refresh_from_db()
+        self.assertTrue(user.check_password('testpass123'))
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+        self.assertTrue(user.check_password('testpass123'))
+
+
+class HashingBackpressureViewTest(TestCase):
+
+    def test_login_answers_503_when_pool_is_full(self):
+        User.objects.create_user(email='busy@example.com', password='testpass123', first_name='Busy')
+
+        with mock.patch('users.hashing.run', side_effect=hashing.HashingPoolSaturated):
+            response = self.client.post(
+                reverse('token-obtain-pair'), {'email': 'busy@example.com', 'password': 'testpass123'},
+                content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
@@ -0,0 +1,121 @@
+# users/tests/test_import_users.py
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.test import TestCase
+
+User = get_user_model()
+
+
+class ImportUsersTest(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'users.ndjson')
+        self.password_hash = make_password('legacy-pass')
+
+    def write(self, rows):
+        with open(self.path, 'w') as f:
+            for row in rows:
+                f.write((row if isinstance(row, str) else json.dumps(row)) + '\n')
+
+    def run_import(self, *args):
+        call_command('import_users', self.path, '--workers', '1', '--chunk-size', '2', *args, stdout=StringIO())
+
+    def test_imports_valid_rows_and_rejects_the_rest(self):
+        self.write([
+            {'email': 'plain@example.com', 'first_name': 'Plain', 'password': 'secret-pass'},
+            {'email': 'legacy@example.com', 'first_name': 'Legacy', 'role': 'admin', 'password_hash': self.password_hash},
+            {'email': 'not-an-email', 'first_name': 'Bad', 'password': 'x'},
+            {'email': 'nohash@example.com', 'first_name': 'Bad', 'password_hash': 'plaintext'},
+            '{broken json',
+            {'email': 'number@example.com', 'first_name': 'Bad', 'password': 12345},
+        ])
+        rejects = self.path + '.rejects'
+        self.run_import('--rejects', rejects)
+
+        self.assertTrue(User.objects.get(email='plain@example.com').check_password('secret-pass'))
+        legacy = User.objects.get(email='legacy@example.com')
+        self.assertEqual(legacy.password, self.password_hash)
+        self.assertEqual(legacy.role, 'admin')
+        self.assertEqual(User.objects.count(), 2)
+        with open(rejects) as f:
+            self.assertEqual([json.loads(line)['row'] for line in f], [3, 4, 5, 6])
+        self.assertFalse(os.path.exists(self.path + '.checkpoint'))
+
+    def test_resumes_after_checkpoint_and_skips_existing_emails(self):
+        rows = [
+            {'email': f'user{i}@example.com', 'first_name': 'User', 'password_hash': self.password_hash}
+            for i in range(4)
+        ]
+        self.write(rows)
+        User.objects.create_user(email='user3@example.com', password='kept', first_name='Existing')
+        with open(self.path + '.checkpoint', 'w') as f:
+            json.dump({'rows': 2}, f)
+
+        self.run_import()
+
+        self.assertEqual(
+            sorted(User.objects.values_list('email', flat=True)),
+            ['user2@example.com', 'user3@example.com']
+        )
+        self.assertTrue(User.objects.get(email='user3@example.com').check_password('kept'))
+
+    def test_resume_drops_rejects_written_after_the_checkpoint(self):
+        self.write([
+            {'email': 'bad-one', 'first_name': 'Bad', 'password': 'x'},
+            {'email': 'user1@example.com', 'first_name': 'User', 'password_hash': self.password_hash},
+            {'email': 'bad-three', 'first_name': 'Bad', 'password': 'x'},
+        ])
+        rejects = self.path + '.rejects'
+        committed = json.dumps({'row': 1, 'errors': ['Enter a valid email address.'], 'data': {}}) + '\n'
+        with open(rejects, 'w') as f:
+            # Row 3 was rejected before the interruption, but its chunk never checkpointed.
+            f.write(committed + json.dumps({'row': 3, 'errors': [], 'data': {}}) + '\n')
+        with open(self.path + '.checkpoint', 'w') as f:
+            json.dump({'rows': 2, 'rejects_offset': len(committed)}, f)
+
+        self.run_import('--rejects', rejects)
+
+        with open(rejects) as f:
+            self.assertEqual([json.loads(line)['row'] for line in f], [1, 3])
+
+    def test_repeated_interruptions_do_not_duplicate_rejects(self):
+        self.write([
+            {'email': 'bad-one', 'first_name': 'Bad', 'password': 'x'},
+            {'email': 'user2@example.com', 'first_name': 'User', 'password_hash': self.password_hash},
+            {'email': 'user3@example.com', 'first_name': 'User', 'password_hash': self.password_hash},
+            {'email': 'user4@example.com', 'first_name': 'User', 'password_hash': self.password_hash},
+            {'email': 'bad-five', 'first_name': 'Bad', 'password': 'x'},
+            {'email': 'user6@example.com', 'first_name': 'User', 'password_hash': self.password_hash},
+        ])
+        rejects = self.path + '.rejects'
+        bulk_create = User.objects.bulk_create
+
+        def crash_on_second_insert():
+            calls = []
+
+            def insert(*args, **kwargs):
+                calls.append(1)
+                if len(calls) == 2:
+                    raise RuntimeError('interrupted')
+                return bulk_create(*args, **kwargs)
+            return mock.patch.object(User.objects, 'bulk_create', side_effect=insert)
+
+        # The first resume starts with a chunk that has no rejects (rows 3-4),
+        # and is interrupted again before row 5's chunk commits.
+        for _ in range(2):
+            with crash_on_second_insert(), self.assertRaises(RuntimeError):
+                self.run_import('--rejects', rejects)
+        self.run_import('--rejects', rejects)
+
+        with open(rejects) as f:
+            self.assertEqual([json.loads(line)['row'] for line in f], [1, 5])
+        self.assertEqual(User.objects.count(), 4)
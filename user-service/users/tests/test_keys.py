@@ -0,0 +1,47 @@
+# users/tests/test_keys.py
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from django.test import SimpleTestCase
+
+from users.keys import KeyRing, SigningKey
+from users.tokens import KeyRingTokenBackend
+
+
+def pem_pair(private_key):
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode('ascii')
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode('ascii')
+    return public_pem, private_pem
+
+
+class KeyRingTest(SimpleTestCase):
+
+    def test_algorithm_and_jwk_follow_key_type(self):
+        cases = [
+            (rsa.generate_private_key(public_exponent=65537, key_size=2048), 'RS256', 'RSA'),
+            (ec.generate_private_key(ec.SECP256R1()), 'ES256', 'EC'),
+            (ed25519.Ed25519PrivateKey.generate(), 'EdDSA', 'OKP'),
+        ]
+        for private_key, algorithm, kty in cases:
+            key = SigningKey(pem_pair(private_key)[0])
+            self.assertEqual(key.algorithm, algorithm)
+            self.assertEqual(key.jwk()['kty'], kty)
+            self.assertEqual(key.jwk()['alg'], algorithm)
+
+    def test_tokens_from_previous_algorithm_still_verify(self):
+        """Moving from RS256 to EdDSA: old RSA tokens stay valid until they expire."""
+        rsa_public, rsa_private = pem_pair(rsa.generate_private_key(public_exponent=65537, key_size=2048))
+        ed_public, ed_private = pem_pair(ed25519.Ed25519PrivateKey.generate())
+
+        old_backend = KeyRingTokenBackend(KeyRing(SigningKey(rsa_public, rsa_private)))
+        new_backend = KeyRingTokenBackend(KeyRing(SigningKey(ed_public, ed_private), [SigningKey(rsa_public)]))
+
+        old_token = old_backend.encode({'user_id': 1})
+        new_token = new_backend.encode({'user_id': 2})
+
+        self.assertEqual(new_backend.decode(old_token)['user_id'], 1)
+        self.assertEqual(new_backend.decode(new_token)['user_id'], 2)
+        self.assertEqual({key['alg'] for key in new_backend.key_ring.jwks()['keys']}, {'RS256', 'EdDSA'})
@@ -0,0 +1,93 @@
+# users/tests/test_revocation.py
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.models import RevokedToken
+from users.revocation import BloomFilter, revocation_store
+
+User = get_user_model()
+
+
+class BloomFilterTest(SimpleTestCase):
+
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'revoked-{i}')
+
+        self.assertTrue(all(f'revoked-{i}' in bloom for i in range(1000)))
+        false_positives = sum(f'live-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class RefreshRevocationTest(APITestCase):
+
+    def setUp(self):
+        revocation_store.reset()
+        User.objects.create_user(email='refresh@example.com', password='testpass123', first_name='Ref')
+        response = self.client.post(
+            reverse('token-obtain-pair'), {'email': 'refresh@example.com', 'password': 'testpass123'}, format='json'
+        )
+        self.refresh = response.data['refresh']
+
+    def post_refresh(self, token):
+        return self.client.post(reverse('token-refresh'), {'refresh': token}, format='json')
+
+    def test_rotated_refresh_token_cannot_be_replayed(self):
+        response = self.post_refresh(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        self.assertNotEqual(response.data['refresh'], self.refresh)
+
+        self.assertEqual(self.post_refresh(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.post_refresh(response.data['refresh']).status_code, status.HTTP_200_OK)
+
+    def test_revoked_token_is_refused(self):
+        response = self.client.post(reverse('token-revoke'), {'refresh': self.refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.post_refresh(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unrevoked_token_is_checked_without_a_query(self):
+        revocation_store.revoke('revoked-jti', timezone.now() + timedelta(days=1))
+        revocation_store.is_revoked('warm-up')
+
+        with self.assertNumQueries(0):
+            self.assertFalse(revocation_store.is_revoked('never-revoked'))
+        self.assertTrue(revocation_store.is_revoked('revoked-jti'))
+
+    def test_periodic_rebuild_runs_off_the_request_path(self):
+        revocation_store.is_revoked('warm-up')
+        current = revocation_store._bloom
+        revocation_store._built_at -= revocation_store.rebuild_interval
+        revocation_store._synced_at = 0.0
+
+        with mock.patch('users.revocation.threading.Thread') as thread:
+            self.assertFalse(revocation_store.is_revoked('never-revoked'))
+        self.assertIs(revocation_store._bloom, current)
+
+        revocation_store.revoke('revoked-during-rebuild', timezone.now() + timedelta(days=1))
+        with mock.patch('users.revocation.connection'):
+            thread.call_args.kwargs['target']()
+
+        self.assertIsNot(revocation_store._bloom, current)
+        self.assertIn('revoked-during-rebuild', revocation_store._bloom)
+        self.assertFalse(revocation_store._rebuilding)
+
+    def test_prune_deletes_only_expired_revocations(self):
+        now = timezone.now()
+        RevokedToken.objects.create(jti='expired', expires_at=now - timedelta(minutes=1))
+        RevokedToken.objects.create(jti='live', expires_at=now + timedelta(days=1))
+
+        call_command('prune_revoked_tokens', '--batch-size', '1', stdout=StringIO())
+
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), ['live'])
@@ -1,7 +1,16 @@
+from unittest import mock
+
+import jwt
+from django.contrib.auth import get_user_model
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 
+from users.profiles import profile_cache
+
+User = get_user_model()
+
 class UserServiceTests(APITestCase):
     def setUp(self):
         self.register_url = reverse('user-register')
@@ -57,3 +66,87 @@ class UserServiceTests(APITestCase):
     def test_get_current_user_unauthenticated(self):
         response = self.client.get(self.me_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_jwks_lists_the_signing_key(self):
+        response = self.client.get(reverse('jwks'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        kids = [key['kid'] for key in response.data['keys']]
+
+        self.client.post(self.register_url, self.user_data, format='json')
+        token_response = self.client.post(self.token_url, self.user_data, format='json')
+        header = jwt.get_unverified_header(token_response.data['access'])
+        self.assertIn(header['kid'], kids)
+
+
+class UserBatchLookupTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('user-batch-lookup')
+        self.users = [
+            User.objects.create_user(email=f'member{i}@example.com', password='x', first_name=f'Member{i}')
+            for i in range(3)
+        ]
+        self.client.force_authenticate(self.users[0])
+
+    def test_returns_compact_records_in_one_query(self):
+        ids = [user.id for user in self.users] + [999999]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'ids': ','.join(map(str, ids))})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([user['first_name'] for user in response.data['users']], ['Member0', 'Member1', 'Member2'])
+        self.assertEqual(set(response.data['users'][0]), {'id', 'first_name', 'last_name', 'profile_picture'})
+        self.assertEqual(response.data['missing'], [999999])
+
+    def test_matching_etag_gets_304(self):
+        ids = ','.join(str(user.id) for user in self.users)
+        etag = self.client.get(self.url, {'ids': ids})['ETag']
+
+        response = self.client.get(self.url, {'ids': ids}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        User.objects.filter(id=self.users[1].id).update(first_name='Renamed')
+        response = self.client.get(self.url, {'ids': ids}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @override_settings(USER_BATCH_MAX_IDS=2)
+    def test_rejects_too_many_or_malformed_ids(self):
+        self.assertEqual(self.client.get(self.url, {'ids': '1,2,3'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'ids': '1,abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ClaimsUserTests(APITestCase):
+    def setUp(self):
+        profile_cache.clear()
+        User.objects.create_user(email='claims@example.com', password='testpass123', first_name='Claire', last_name='Ims')
+        response = self.client.post(
+            reverse('token-obtain-pair'), {'email': 'claims@example.com', 'password': 'testpass123'}, format='json'
+        )
+        self.access = response.data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+
+    def test_token_carries_profile_claims(self):
+        claims = jwt.decode(self.access, options={'verify_signature': False})
+        self.assertEqual((claims['first_name'], claims['last_name'], claims['role']), ('Claire', 'Ims', 'user'))
+
+    def test_whoami_needs_no_queries_once_profile_is_cached(self):
+        self.client.get(reverse('current-user'))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('current-user'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], 'claims@example.com')
+        self.assertEqual(response.data['first_name'], 'Claire')
+        self.assertIsNone(response.data['profile_picture'])
+
+    def test_saving_the_user_refreshes_the_cached_profile(self):
+        self.client.get(reverse('current-user'))
+        user = User.objects.get(email='claims@example.com')
+
+        with mock.patch('users.signals.publish_user_event'), self.captureOnCommitCallbacks(execute=True):
+            user.profile_picture = 'profile_pictures/new.png'
+            user.save()
+        response = self.client.get(reverse('current-user'))
+
+        self.assertTrue(response.data['profile_picture'].endswith('profile_pictures/new.png'))
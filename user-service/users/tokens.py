@@ -0,0 +1,112 @@
+import jwt
+from django.utils.translation import gettext_lazy as _
+from jwt.exceptions import ExpiredSignatureError, InvalidAlgorithmError, InvalidTokenError
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError, TokenBackendExpiredToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken as BaseAccessToken
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from .keys import get_key_ring
+
+
+class KeyRingTokenBackend(TokenBackend):
+    """
+    Signs with the key ring's current key and stamps its `kid` in the header.
+    Verifies with whichever ring key the token's `kid` names, so tokens minted
+    before a rotation keep working until they expire.
+    """
+
+    def __init__(self, key_ring):
+        super().__init__(
+            key_ring.current.algorithm,
+            audience=api_settings.AUDIENCE,
+            issuer=api_settings.ISSUER,
+            leeway=api_settings.LEEWAY,
+            json_encoder=api_settings.JSON_ENCODER,
+        )
+        self.key_ring = key_ring
+
+    def encode(self, payload):
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload['aud'] = self.audience
+        if self.issuer is not None:
+            jwt_payload['iss'] = self.issuer
+
+        current = self.key_ring.current
+        return jwt.encode(
+            jwt_payload,
+            current.private_key,
+            algorithm=current.algorithm,
+            headers={'kid': current.kid},
+            json_encoder=self.json_encoder,
+        )
+
+    def decode(self, token, verify=True):
+        try:
+            kid = jwt.get_unverified_header(token).get('kid')
+        except InvalidTokenError as e:
+            raise TokenBackendError(_("Token is invalid")) from e
+
+        # Tokens issued before kids were introduced carry none: use the current key.
+        key = self.key_ring.get(kid) if kid else self.key_ring.current
+        if key is None:
+            raise TokenBackendError(_("Token is invalid"))
+
+        try:
+            return jwt.decode(
+                token,
+                key.public_key,
+                algorithms=[key.algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.get_leeway(),
+                options={
+                    'verify_aud': self.audience is not None,
+                    'verify_signature': verify,
+                },
+            )
+        except InvalidAlgorithmError as e:
+            raise TokenBackendError(_("Invalid algorithm specified")) from e
+        except ExpiredSignatureError as e:
+            raise TokenBackendExpiredToken(_("Token is expired")) from e
+        except InvalidTokenError as e:
+            raise TokenBackendError(_("Token is invalid")) from e
+
+
+_token_backend = None
+
+
+def get_token_backend():
+    global _token_backend
+    if _token_backend is None:
+        _token_backend = KeyRingTokenBackend(get_key_ring())
+    return _token_backend
+
+
+class KeyRingTokenMixin:
+    @property
+    def token_backend(self):
+        return get_token_backend()
+
+
+class AccessToken(KeyRingTokenMixin, BaseAccessToken):
+    pass
+
+
+# User fields embedded in every token, so read endpoints can answer from
+# claims alone (see users.profiles.ClaimsUser).
+PROFILE_CLAIMS = ('email', 'role', 'first_name', 'last_name')
+
+
+class RefreshToken(KeyRingTokenMixin, BaseRefreshToken):
+    access_token_class = AccessToken
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        # Access tokens minted from this refresh token copy these claims.
+        for claim in PROFILE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
@@ -1,8 +1,15 @@
 from django.urls import path
-from .views import UserRegistrationView, GetCurrentUserView, CustomTokenObtainPairView
+from .views import (
+    UserRegistrationView, GetCurrentUserView, CustomTokenObtainPairView, CustomTokenRefreshView,
+    TokenRevokeView, JWKSView, UserBatchLookupView
+)
 
 urlpatterns = [
     path('register/', UserRegistrationView.as_view(), name='user-register'),
     path('whoami/', GetCurrentUserView.as_view(), name='current-user'),
     path('token/', CustomTokenObtainPairView.as_view(), name='token-obtain-pair'),
+    path('token/refresh/', CustomTokenRefreshView.as_view(), name='token-refresh'),
+    path('token/revoke/', TokenRevokeView.as_view(), name='token-revoke'),
+    path('users/', UserBatchLookupView.as_view(), name='user-batch-lookup'),
+    path('.well-known/jwks.json', JWKSView.as_view(), name='jwks'),
 ]   
\ No newline at end of file
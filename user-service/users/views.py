@@ -2,13 +2,24 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenViewBase
 
 # standard imports
+import hashlib
+import json
+
 from django.contrib.auth import get_user_model
 from django.conf import settings
-from .serializers import RegistrationSerializer, CustomTokenObtainPairSerializer
+from django.core.files.storage import default_storage
+from django.utils.cache import get_conditional_response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from .hashing import HashingPoolSaturated
+from .keys import get_key_ring
+from .serializers import (
+    RegistrationSerializer, CustomTokenObtainPairSerializer, TokenRefreshSerializer, TokenRevokeSerializer
+)
+from .tokens import RefreshToken
 
 # Get the custom user model
 CustomUser = get_user_model()
@@ -21,6 +32,18 @@ def get_tokens_for_user(user):
     return str(refresh), str(access)
 
 
+def hashing_unavailable():
+    """
+    Fast rejection while the password hashing pool is full, so clients back
+    off instead of piling onto a slow queue.
+    """
+    return Response(
+        {"detail": "Too many sign-in requests, please retry shortly."},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': str(settings.PASSWORD_HASH_RETRY_AFTER)},
+    )
+
+
 # User Registration View
 class UserRegistrationView(APIView):
     """
@@ -41,6 +64,8 @@ class UserRegistrationView(APIView):
             
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
+        except HashingPoolSaturated:
+            return hashing_unavailable()
         except Exception as e:
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -49,7 +74,9 @@ class UserRegistrationView(APIView):
 class GetCurrentUserView(APIView):
     """
     Retrieve the current authenticated user's details.
+    Answered from token claims and the profile cache, without a user query.
     """
+    authentication_classes = [JWTStatelessUserAuthentication]
 
     def get(self, request):
         try:
@@ -77,5 +104,85 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     def post(self, request, *args, **kwargs):
         try:
             return super().post(request, *args, **kwargs)
+        except HashingPoolSaturated:
+            return hashing_unavailable()
         except Exception as e:
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# Token Refresh View
+class CustomTokenRefreshView(TokenRefreshView):
+    """
+    Exchange a refresh token for a new access token (and, with rotation, a
+    new refresh token). Revoked refresh tokens are refused.
+    """
+    serializer_class = TokenRefreshSerializer
+
+
+# Token Revoke View
+class TokenRevokeView(TokenViewBase):
+    """
+    Revoke a refresh token, e.g. on logout.
+    """
+    serializer_class = TokenRevokeSerializer
+
+
+# JSON Web Key Set View
+class JWKSView(APIView):
+    """
+    Publish the public keys that verify our tokens, identified by `kid`.
+    Consumers cache this document and refresh it in the background.
+    """
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        response = Response(get_key_ring().jwks(), status=status.HTTP_200_OK)
+        response['Cache-Control'] = 'public, max-age=300'
+        return response
+
+
+# Batch User Lookup View
+class UserBatchLookupView(APIView):
+    """
+    Compact public profiles for up to USER_BATCH_MAX_IDS users, so other
+    services can render rosters with one call instead of one per user.
+
+    - GET ?ids=1,2,3 -> {"users": [...], "missing": [...]}, one query.
+    - Responses carry an ETag; a matching If-None-Match gets 304.
+    """
+    authentication_classes = [JWTStatelessUserAuthentication]
+    permission_classes = [IsAuthenticated]
+    fields = ('id', 'first_name', 'last_name', 'profile_picture')
+
+    def get(self, request):
+        try:
+            ids = sorted({int(value) for value in request.query_params.get('ids', '').split(',') if value.strip()})
+        except ValueError:
+            return Response({"detail": "ids must be a comma-separated list of integers."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if not ids:
+            return Response({"detail": "ids is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > settings.USER_BATCH_MAX_IDS:
+            return Response({"detail": f"At most {settings.USER_BATCH_MAX_IDS} ids per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        users = list(
+            CustomUser.objects.filter(id__in=ids, is_active=True).order_by('id').values(*self.fields)
+        )
+        for user in users:
+            picture = user['profile_picture']
+            user['profile_picture'] = default_storage.url(picture) if picture else None
+
+        found = {user['id'] for user in users}
+        payload = {'users': users, 'missing': [i for i in ids if i not in found]}
+        body = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+        response = Response(payload, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        # Callers may keep the result but must revalidate before reusing it.
+        response['Cache-Control'] = 'private, no-cache'
+        # Swaps in a bodiless 304 (keeping these headers) when If-None-Match matches.
+        return get_conditional_response(request, etag=etag, response=response)